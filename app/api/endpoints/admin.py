@@ -1,12 +1,51 @@
+import csv
+import os
+import shutil
+import uuid
+
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
-import csv, io
+
 from app.db import get_db
-from app.models.models import School, Department, Professor
+from app.jobs import create_job, job_to_dict, requeue_job, store_upload_path, submit_job
+from app.models.models import ImportJob, School
+from app.utils import profiling
+from app.utils.deps import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# Upload is copied to disk in chunks of this size, so memory use does not
+# depend on how big the CSV is.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+REQUIRED_HEADERS = {"first_name","last_name","department","level","email","bio","photo_url","profile_url"}
+
+def _spool(upload, path: str) -> None:
+    with open(path, "wb") as out:
+        shutil.copyfileobj(upload, out, UPLOAD_CHUNK_SIZE)
+
+
+def _start_import(db: Session, path: str, filename: str, school_name: str) -> ImportJob:
+    with open(path, newline="", encoding="utf-8", errors="ignore") as f:
+        fieldnames = csv.DictReader(f).fieldnames
+    missing = REQUIRED_HEADERS - set(fieldnames or [])
+    if missing:
+        os.unlink(path)
+        raise HTTPException(status_code=400, detail=f"CSV missing headers: {missing}")
+
+    school = db.query(School).filter(School.name==school_name).first()
+    if not school:
+        school = School(name=school_name)
+        db.add(school); db.commit(); db.refresh(school)
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+    job = create_job(db, path, school_id=school.id, filename=filename, delete_when_done=True)
+    submit_job(job.id)
+    return job
 
-@router.post("/seed")
+
+@router.post("/seed", status_code=202)
 async def admin_seed(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -15,46 +54,50 @@ async def admin_seed(
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Please upload a CSV")
 
-    content = await file.read()
-    text = content.decode("utf-8", errors="ignore")
-    reader = csv.DictReader(io.StringIO(text))
+    # Spool the upload to IMPORT_DIR chunk by chunk; the job reads it back as
+    # a stream, and it stays there until the job is done so it can resume.
+    # File and database work runs in the threadpool, off the event loop.
+    path = store_upload_path(uuid.uuid4().hex)
+    await run_in_threadpool(_spool, file.file, path)
+    job = await run_in_threadpool(_start_import, db, path, file.filename, school_name)
+    return {"job_id": job.id, "status": job.status}
 
-    required = {"first_name","last_name","department","level","email","bio","photo_url","profile_url"}
-    missing = required - set(reader.fieldnames or [])
-    if missing:
-        raise HTTPException(status_code=400, detail=f"CSV missing headers: {missing}")
 
-    school = db.query(School).filter(School.name==school_name).first()
-    if not school:
-        school = School(name=school_name)
-        db.add(school); db.commit(); db.refresh(school)
+@router.get("/jobs")
+def list_jobs(limit: int = 20, db: Session = Depends(get_db)):
+    jobs = db.query(ImportJob).order_by(ImportJob.created_at.desc()).limit(limit).all()
+    return {"items": [job_to_dict(j) for j in jobs]}
+
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    job = db.get(ImportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+@router.post("/jobs/{job_id}/resume", status_code=202)
+def resume_job(job_id: str, db: Session = Depends(get_db)):
+    """Retry a failed job from its last committed batch."""
+    if not requeue_job(db, job_id):
+        job = db.get(ImportJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    submit_job(job_id)
+    return job_to_dict(db.get(ImportJob, job_id))
+
+
+@router.get("/profiles")
+def list_profiles(limit: int = 50):
+    """Stored request profiles, newest first (see app.utils.profiling)."""
+    return {"items": profiling.list_profiles()[:limit]}
+
 
-    def upsert_department(name: str):
-        d = db.query(Department).filter(
-            Department.school_id==school.id,
-            Department.name==name.strip()
-        ).first()
-        if not d:
-            d = Department(school_id=school.id, name=name.strip())
-            db.add(d); db.commit(); db.refresh(d)
-        return d
-
-    count = 0
-    for row in reader:
-        dept = upsert_department(row["department"]) if row.get("department") else None
-        prof = Professor(
-            school_id=school.id,
-            department_id=dept.id if dept else None,
-            first_name=row["first_name"].strip(),
-            last_name=row["last_name"].strip(),
-            level=row.get("level"),
-            email=row.get("email"),
-            bio=row.get("bio"),
-            photo_url=row.get("photo_url"),
-            profile_url=row.get("profile_url"),
-        )
-        db.add(prof); count += 1
-        if count % 50 == 0:
-            db.flush()
-    db.commit()
-    return {"inserted": count}
+@router.get("/profiles/{name}")
+def get_profile(name: str):
+    path = profiling.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name)
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 from pydantic import EmailStr
 from app.schemas import UserCreate, UserOut, Token
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import hash_password_async, verify_and_update_async, create_access_token
 from app.core.config import settings
 from app.db import get_db
 from app.models.models import User
@@ -14,22 +15,36 @@ def is_allowed_email(email: str) -> bool:
     domain = email.split("@")[-1].lower()
     return domain.endswith(settings.ALLOWED_EMAIL_DOMAIN)
 
-@router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    if not is_allowed_email(user_in.email):
-        raise HTTPException(status_code=400, detail=f"Only {settings.ALLOWED_EMAIL_DOMAIN} emails may register")
-    if db.query(User).filter(User.email == user_in.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
-    user = User(name=user_in.name, email=user_in.email, password_hash=hash_password(user_in.password))
+def _user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+def _save(db: Session, user: User) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
+# Async handlers so bcrypt runs on the hash pool without holding a
+# threadpool worker; the short DB calls go to the threadpool instead.
+@router.post("/register", response_model=UserOut)
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+    if not is_allowed_email(user_in.email):
+        raise HTTPException(status_code=400, detail=f"Only {settings.ALLOWED_EMAIL_DOMAIN} emails may register")
+    if await run_in_threadpool(_user_by_email, db, user_in.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    password_hash = await hash_password_async(user_in.password)
+    user = User(name=user_in.name, email=user_in.email, password_hash=password_hash)
+    return await run_in_threadpool(_save, db, user)
+
 @router.post("/login", response_model=Token)
-def login(user_in: UserCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if not user or not verify_password(user_in.password, user.password_hash):
+async def login(user_in: UserCreate, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_user_by_email, db, user_in.email)
+    ok, new_hash = await verify_and_update_async(user_in.password, user.password_hash) if user else (False, None)
+    if not ok:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # stored with an old work factor; upgrade it transparently
+        user.password_hash = new_hash
+        await run_in_threadpool(db.commit)
     token = create_access_token({"sub": str(user.id)})
     return Token(access_token=token)
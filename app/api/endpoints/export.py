@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.db import ReadSessionLocal
+from app.export import FORMATS, export_chunks, gzip_chunks
+from app.utils.deps import require_admin
+
+# exports carry emails and rater ids: admins only, like /admin/*
+router = APIRouter(prefix="/export", tags=["export"], dependencies=[Depends(require_admin)])
+
+
+def export_response(kind: str, fmt: str, gzip: bool, school_id: int | None,
+                    updated_since: datetime | None) -> StreamingResponse:
+    """
+    Stream the export. The generator owns its session (not a request
+    dependency), so it stays open exactly as long as the body is being sent.
+    """
+    def body():
+        with ReadSessionLocal() as db:
+            yield from export_chunks(db, kind, fmt, school_id, updated_since)
+
+    media_type, ext = FORMATS[fmt]
+    filename = f"{kind}.{ext}"
+    chunks = body()
+    if gzip:
+        chunks, media_type, filename = gzip_chunks(chunks), "application/gzip", filename + ".gz"
+    return StreamingResponse(
+        chunks, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/professors")
+def export_professors(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    school_id: int | None = None,
+    updated_since: datetime | None = Query(default=None, description="ISO 8601; compared in UTC"),
+):
+    """Every professor (optionally one school / changed since), in the seeders' CSV layout."""
+    return export_response("professors", format, gzip, school_id, updated_since)
+
+
+@router.get("/ratings")
+def export_ratings(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    school_id: int | None = None,
+    updated_since: datetime | None = Query(default=None, description="ISO 8601; compared in UTC"),
+):
+    return export_response("ratings", format, gzip, school_id, updated_since)
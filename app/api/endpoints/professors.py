@@ -1,40 +1,303 @@
-from fastapi import APIRouter, Depends, HTTPException
+import queue
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.models.models import Professor
+from app.core.config import settings
+from app.db import get_async_db, get_async_read_db, get_db, get_read_db
+from app.models.models import Department, Professor, ProfessorRatingStats, Rating, User
+from app.schemas import (
+    ProfessorBatch, ProfessorDetail, ProfessorIdsIn, RatingCreate, RatingOut, RatingQueued,
+)
+from app.utils.cache import cached_json, cached_json_async, invalidate_professor
+from app.utils.deps import get_current_user, get_current_user_async
+from app.utils.leaderboards import leaderboards
+from app.utils.pagination import MAX_INT64
+from app.utils.rating_buffer import PendingRating, rating_buffer
+from app.utils.ratings import add_rating, add_rating_async
+from app.utils.search import search_professors, search_professors_async
 
 router = APIRouter(prefix="/professors", tags=["professors"])
+# Same routes as `router`, served on an AsyncSession (DB_ASYNC=true)
+async_router = APIRouter(prefix="/professors", tags=["professors"])
+
+
+# -----------------------------
+# Statements + response shaping, shared by the sync and async handlers
+# -----------------------------
+MAX_BATCH_IDS = 1000
+# ids per IN (...) list; keeps well under SQLite's bound-parameter limit
+BATCH_CHUNK = 500
+
+
+# exactly what professor_result reads: no entities, no unused columns
+DETAIL_COLUMNS = (
+    Professor.id, Professor.first_name, Professor.last_name, Professor.level, Professor.email,
+    Professor.bio, Professor.photo_url, Professor.rating, Department.name.label("department"),
+    ProfessorRatingStats.ratings_count, ProfessorRatingStats.stars_sum,
+    *(getattr(ProfessorRatingStats, f"stars_{k}") for k in range(1, 6)),
+)
+
+
+def _professor_select():
+    return (
+        select(*DETAIL_COLUMNS)
+        .outerjoin(Department, Professor.department_id == Department.id)
+        .outerjoin(ProfessorRatingStats, ProfessorRatingStats.professor_id == Professor.id)
+    )
+
+
+def professor_statement(professor_id: int):
+    """Professor, department name and rating aggregate in one round trip."""
+    return _professor_select().where(Professor.id == professor_id)
+
+
+def parse_ids(raw) -> list[int]:
+    """
+    '3,1,3' or [3, 1, 3] -> [3, 1]: input order kept, duplicates dropped.
+    Ids must be positive and fit the 64-bit id column.
+    """
+    if isinstance(raw, str):
+        try:
+            raw = [int(part) for part in raw.split(",") if part.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not all(1 <= pid <= MAX_INT64 for pid in raw):
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    ids = list(dict.fromkeys(raw))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No ids given")
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
+
+def professors_statements(ids: list[int]):
+    """One statement per BATCH_CHUNK ids, whatever the number of professors."""
+    return [
+        _professor_select().where(Professor.id.in_(ids[i:i + BATCH_CHUNK]))
+        for i in range(0, len(ids), BATCH_CHUNK)
+    ]
+
+
+def professors_batch_result(ids: list[int], rows) -> ProfessorBatch:
+    found = {row.id: row for row in rows}
+    return ProfessorBatch(
+        items=[professor_result(found[pid]) for pid in ids if pid in found],
+        missing=[pid for pid in ids if pid not in found],
+    )
+
+
+def professor_result(row) -> ProfessorDetail:
+    """Shape one professor_statement row (DETAIL_COLUMNS; stats columns NULL when unrated)."""
+    if row is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+
+    # live aggregate from submitted ratings; CSV rating only as a fallback
+    count = row.ratings_count or 0
+    avg_stars = round(row.stars_sum / count, 2) if count else None
+    return ProfessorDetail(
+        id=row.id,
+        first_name=row.first_name,
+        last_name=row.last_name,
+        name=f"{row.first_name} {row.last_name}",
+        department=row.department,
+        level=row.level,
+        email=row.email,
+        bio=row.bio,
+        photo_url=row.photo_url,
+        rating=avg_stars if avg_stars is not None else row.rating,
+        avg_stars=avg_stars,
+        ratings_count=count,
+        histogram=[row.stars_1 or 0, row.stars_2 or 0, row.stars_3 or 0, row.stars_4 or 0, row.stars_5 or 0],
+    )
+
+
+def queue_rating(professor_id: int, school_id: int | None, rating_in: RatingCreate,
+                 user_id: int) -> ORJSONResponse:
+    """Write-behind path: 202 once queued, 503 when the buffer is full."""
+    pending = PendingRating(professor_id, school_id, rating_in.stars, rating_in.comment, user_id)
+    try:
+        rating_buffer.submit(pending)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="Too many ratings in flight, retry shortly",
+                            headers={"Retry-After": "1"})
+    queued = RatingQueued(professor_id=professor_id, stars=pending.stars,
+                          comment=pending.comment, created_at=pending.created_at)
+    return ORJSONResponse(queued.model_dump(mode="json"), status_code=202)
+
+
+RATING_RESPONSES = {202: {"model": RatingQueued}, 401: {"description": "Missing or invalid bearer token"},
+                    503: {"description": "Write-behind queue full"}}
+
+
+def ratings_statement(professor_id: int, limit: int, offset: int):
+    return (
+        select(Rating)
+        .where(Rating.professor_id == professor_id)
+        .order_by(Rating.created_at.desc(), Rating.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+# -----------------------------
+# Sync handlers
+# -----------------------------
+@router.get("/search")
+def search(
+    q: str = Query(..., min_length=1, description="name, department, bio or school"),
+    limit: int = Query(default=20, ge=1, le=100),
+    school_id: int | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Ranked full-text search; the last word is matched as a prefix for typeahead.
+    Declared before /{professor_id} so "search" is not parsed as an id.
+    """
+    return {"items": search_professors(db, q, limit=limit, school_id=school_id)}
+
+
+@router.get("")
+def get_professors(
+    request: Request,
+    ids: str = Query(..., description="comma-separated ids, e.g. 1,2,3"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Several professors with department names and rating aggregates in one
+    call, in the order requested; unknown ids are listed under "missing".
+    """
+    pids = parse_ids(ids)
+
+    def build():
+        rows = [row for stmt in professors_statements(pids) for row in db.execute(stmt)]
+        return professors_batch_result(pids, rows)
+
+    return cached_json(request, [f"professor:{pid}" for pid in pids], build)
+
+
+@router.post("/batch", response_model=ProfessorBatch)
+def get_professors_batch(body: ProfessorIdsIn, db: Session = Depends(get_read_db)):
+    """GET /professors?ids= for id lists too long for a URL."""
+    pids = parse_ids(body.ids)
+    rows = [row for stmt in professors_statements(pids) for row in db.execute(stmt)]
+    return professors_batch_result(pids, rows)
 
 
 @router.get("/{professor_id}")
-def get_professor(professor_id: int, db: Session = Depends(get_db)):
+def get_professor(professor_id: int, request: Request, db: Session = Depends(get_read_db)):
     """
     Return a single professor by id.
-    We flatten department to a plain string so the frontend can render it safely.
     """
+    return cached_json(
+        request,
+        [f"professor:{professor_id}"],
+        lambda: professor_result(db.execute(professor_statement(professor_id)).first()),
+    )
+
+
+@router.get("/{professor_id}/ratings", response_model=List[RatingOut])
+def list_ratings(
+    professor_id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    if db.get(Professor, professor_id) is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+    return db.scalars(ratings_statement(professor_id, limit, offset)).all()
+
+
+@router.post("/{professor_id}/ratings", response_model=RatingOut, status_code=201,
+             responses=RATING_RESPONSES)
+def create_rating(professor_id: int, rating_in: RatingCreate, db: Session = Depends(get_db),
+                  user: User = Depends(get_current_user)):
     prof = db.get(Professor, professor_id)
     if prof is None:
         raise HTTPException(status_code=404, detail="Professor not found")
+    if settings.RATINGS_WRITE_BEHIND:
+        return queue_rating(professor_id, prof.school_id, rating_in, user.id)
+    before = leaderboards.snapshot(prof.school_id)
+    rating = add_rating(db, professor_id, rating_in.stars, rating_in.comment, user_id=user.id)
+    invalidate_professor(professor_id, prof.school_id)
+    leaderboards.record(prof.school_id, [(professor_id, rating.stars)], before)
+    return rating
+
+
+# -----------------------------
+# Async handlers
+# -----------------------------
+@async_router.get("/search")
+async def search_async(
+    q: str = Query(..., min_length=1, description="name, department, bio or school"),
+    limit: int = Query(default=20, ge=1, le=100),
+    school_id: int | None = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return {"items": await search_professors_async(db, q, limit=limit, school_id=school_id)}
+
+
+@async_router.get("")
+async def get_professors_async(
+    request: Request,
+    ids: str = Query(..., description="comma-separated ids, e.g. 1,2,3"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    pids = parse_ids(ids)
+
+    async def build():
+        rows = [row for stmt in professors_statements(pids) for row in await db.execute(stmt)]
+        return professors_batch_result(pids, rows)
+
+    return await cached_json_async(request, [f"professor:{pid}" for pid in pids], build)
+
+
+@async_router.post("/batch", response_model=ProfessorBatch)
+async def get_professors_batch_async(body: ProfessorIdsIn, db: AsyncSession = Depends(get_async_read_db)):
+    pids = parse_ids(body.ids)
+    rows = [row for stmt in professors_statements(pids) for row in await db.execute(stmt)]
+    return professors_batch_result(pids, rows)
+
+
+@async_router.get("/{professor_id}")
+async def get_professor_async(professor_id: int, request: Request,
+                              db: AsyncSession = Depends(get_async_read_db)):
+    async def build():
+        return professor_result((await db.execute(professor_statement(professor_id))).first())
+
+    return await cached_json_async(request, [f"professor:{professor_id}"], build)
+
+
+@async_router.get("/{professor_id}/ratings", response_model=List[RatingOut])
+async def list_ratings_async(
+    professor_id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if await db.get(Professor, professor_id) is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+    return (await db.scalars(ratings_statement(professor_id, limit, offset))).all()
 
-    # rating / avg_rating
-    rating = getattr(prof, "rating", None)
-    if rating is None and hasattr(prof, "avg_rating"):
-        rating = getattr(prof, "avg_rating")
-
-    # 🔹 FLATTEN department: if it's an object, use its .name
-    dept = getattr(prof, "department", None)
-    if dept is not None and not isinstance(dept, str):
-        dept = getattr(dept, "name", str(dept))
-
-    return {
-        "id": prof.id,
-        "first_name": getattr(prof, "first_name", None),
-        "last_name": getattr(prof, "last_name", None),
-        "name": getattr(prof, "name", None),
-        "department": dept,
-        "level": getattr(prof, "level", None),
-        "email": getattr(prof, "email", None),
-        "rating": rating,
-        "bio": getattr(prof, "bio", None),
-    }
+
+@async_router.post("/{professor_id}/ratings", response_model=RatingOut, status_code=201,
+                   responses=RATING_RESPONSES)
+async def create_rating_async(professor_id: int, rating_in: RatingCreate,
+                              db: AsyncSession = Depends(get_async_db),
+                              user: User = Depends(get_current_user_async)):
+    prof = await db.get(Professor, professor_id)
+    if prof is None:
+        raise HTTPException(status_code=404, detail="Professor not found")
+    school_id = prof.school_id
+    if settings.RATINGS_WRITE_BEHIND:
+        return queue_rating(professor_id, school_id, rating_in, user.id)
+    before = leaderboards.snapshot(school_id)
+    rating = await add_rating_async(db, professor_id, rating_in.stars, rating_in.comment, user_id=user.id)
+    invalidate_professor(professor_id, school_id)
+    leaderboards.record(school_id, [(professor_id, rating.stars)], before)
+    return rating
@@ -1,95 +1,392 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
-from app.db import get_db
+from typing import Literal, Optional
+from app.core.config import settings
+from app.db import get_async_read_db, get_read_db
 from app.models.models import School, Professor, Department
+from app.schemas import (
+    Leaderboard, ProfessorPage, ProfessorSummary, SchoolOut, SchoolPage, SchoolSummary,
+)
+from app.utils.cache import cached_json, cached_json_async
+from app.utils.facets import TUITION_BUCKETS, school_facets
+from app.utils.geo import to_state_code
+from app.utils.leaderboards import leaderboards
+from app.utils.pagination import decode_cursor, split_page
 
 router = APIRouter(prefix="/schools", tags=["schools"])
+# Same routes as `router`, served on an AsyncSession (DB_ASYNC=true)
+async_router = APIRouter(prefix="/schools", tags=["schools"])
 
-def _normalize_state_filter(value: str | None):
-    if not value: return None
-    v = value.strip()
-    # Accept "GA" or "Georgia"
-    if len(v) == 2:
-        return v.upper()  # we'll match by abbreviation substring
-    return v.title()
+MAX_PAGE_SIZE = 100
 
-@router.get("/search")
-def search_schools(
-    state: str | None = None,
-    public_private: str | None = None,   # "public" | "private"
-    tuition_contains: str | None = None, # substring search in tuition_text
-    page: int = 1,
-    page_size: int = 20,
-    db: Session = Depends(get_db),
-):
-    q = db.query(School)
+TUITION_COLUMNS = {
+    "in_state": School.tuition_in_state,
+    "out_of_state": School.tuition_out_of_state,
+}
+
+# ?fields= name -> the columns it needs. List queries select only these
+# (plain row tuples, no ORM identity map); unrequested keys are left out.
+SCHOOL_FIELDS = {
+    "id": (School.id,),
+    "name": (School.name,),
+    "city": (School.city,),
+    "state": (School.state,),
+    "state_code": (School.state_code,),
+    "public_private": (School.public_private,),
+    "tuition": (School.tuition_text,),
+    "tuition_in_state": (School.tuition_in_state,),
+    "tuition_out_of_state": (School.tuition_out_of_state,),
+}
+PROFESSOR_FIELDS = {
+    "id": (Professor.id,),
+    "name": (Professor.first_name, Professor.last_name),
+    "department": (Department.name.label("department"),),
+    "level": (Professor.level,),
+    "email": (Professor.email,),
+    "rating": (Professor.rating,),
+    "bio": (Professor.bio,),
+    "school_id": (Professor.school_id,),
+}
+# bio is TEXT and no list view shows it, so it is only loaded on request
+DEFAULT_PROFESSOR_FIELDS = tuple(f for f in PROFESSOR_FIELDS if f != "bio")
+
+def parse_fields(raw: str | None, allowed: dict, default) -> tuple[str, ...]:
+    if not raw:
+        return tuple(default)
+    # id is always returned: it is the item key and part of every cursor
+    fields = tuple(dict.fromkeys(["id", *(f.strip() for f in raw.split(",") if f.strip())]))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def _columns(fields, allowed, *always):
+    """Columns for `fields` plus `always` (keyset keys), each selected once."""
+    columns = {}
+    for col in [*always, *(c for f in fields for c in allowed[f])]:
+        columns.setdefault(col.key, col)
+    return list(columns.values())
+
+def _count(stmt):
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+# -----------------------------
+# Statements + response shaping, shared by the sync and async handlers
+# -----------------------------
+def search_statements(state, public_private, tuition_contains, page, page_size, cursor, include_total,
+                      tuition_min=None, tuition_max=None, tuition_basis="in_state", max_tuition=None,
+                      fields=tuple(SCHOOL_FIELDS)):
+    """Return (count_stmt or None, page_stmt) for /schools/search."""
+    stmt = select(*_columns(fields, SCHOOL_FIELDS, School.id))
     if state:
-        f = _normalize_state_filter(state)
-        # match either abbreviation within tuition "City, State" text or full name
-        q = q.filter((School.state.ilike(f"%{f}%")) | (School.city.ilike(f"%{f}%")))
+        code = to_state_code(state)
+        if code:
+            # "GA" / "ga" / "Georgia" all hit ix_schools_state_code
+            stmt = stmt.where(School.state_code == code)
+        else:
+            stmt = stmt.where(School.city.ilike(state.strip()))
     if public_private:
-        q = q.filter(School.public_private.ilike(public_private))
+        stmt = stmt.where(func.lower(School.public_private) == public_private.strip().lower())
+    tuition = TUITION_COLUMNS[tuition_basis]
+    if tuition_min is not None:
+        stmt = stmt.where(tuition >= tuition_min)
+    if tuition_max is not None:
+        stmt = stmt.where(tuition <= tuition_max)
+    if max_tuition is not None:
+        # the home page's "max tuition" box is documented as out-of-state
+        stmt = stmt.where(School.tuition_out_of_state <= max_tuition)
     if tuition_contains:
-        q = q.filter(School.tuition_text.ilike(f"%{tuition_contains}%"))
+        stmt = stmt.where(School.tuition_text.ilike(f"%{tuition_contains}%"))
+
+    count_stmt = _count(stmt) if include_total else None
+    stmt = stmt.order_by(School.id.asc())
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        stmt = stmt.where(School.id > last_id)
+    else:
+        stmt = stmt.offset((page-1)*page_size)
+    return count_stmt, stmt.limit(page_size + 1)
+
+def search_result(rows, total, page, page_size, cursor, fields=tuple(SCHOOL_FIELDS)):
+    items, next_cursor = split_page(rows, page_size, lambda s: (s.id,))
+    return SchoolPage(
+        total=total,
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        items=[
+            SchoolSummary.model_validate(
+                {f: s.tuition_text if f == "tuition" else getattr(s, f) for f in fields}
+            ) for s in items
+        ],
+    )
+
+def school_result(school):
+    if not school:
+        raise HTTPException(status_code=404, detail="School not found")
+    return SchoolOut.model_validate(school)
 
-    total = q.count()
-    items = q.offset((page-1)*page_size).limit(page_size).all()
+def facet_filters(state, public_private, tuition, tuition_basis):
+    if tuition and tuition not in {key for key, _, _ in TUITION_BUCKETS}:
+        raise HTTPException(status_code=400, detail=f"Unknown tuition bucket: {tuition}")
     return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "items": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "city": s.city,
-                "state": s.state,
-                "public_private": s.public_private,
-                "tuition": s.tuition_text,
-            } for s in items
-        ]
+        # a value that isn't a state simply matches nothing
+        "state": (to_state_code(state) or state.strip().upper()) if state else None,
+        "public_private": public_private.strip().lower() if public_private else None,
+        f"tuition_{tuition_basis}": tuition,
     }
 
+def facets_result(filters):
+    result = school_facets.counts(filters)
+    result["tuition_buckets"] = [
+        {"key": key, "min": low, "max": high} for key, low, high in TUITION_BUCKETS
+    ]
+    return result
+
+def school_exists_statement(school_id):
+    return select(School.id).where(School.id == school_id)
+
+def professors_statements(school_id, level, department, search, page, page_size, cursor, include_total,
+                          fields=DEFAULT_PROFESSOR_FIELDS):
+    """Return (count_stmt or None, page_stmt) for /schools/{id}/professors."""
+    # (last_name, id) is always selected for the keyset cursor
+    stmt = select(*_columns(fields, PROFESSOR_FIELDS, Professor.id, Professor.last_name))
+    if "department" in fields or department:
+        stmt = stmt.outerjoin(Department, Professor.department_id == Department.id)
+    stmt = stmt.where(Professor.school_id == school_id)
+    if level:
+        stmt = stmt.where(Professor.level.ilike(f"%{level.strip()}%"))
+    if department:
+        stmt = stmt.where(Department.name.ilike(department.strip()))
+    if search:
+        term = f"%{search.strip()}%"
+        stmt = stmt.where(or_(Professor.first_name.ilike(term), Professor.last_name.ilike(term)))
+
+    count_stmt = _count(stmt) if include_total else None
+    stmt = stmt.order_by(Professor.last_name.asc(), Professor.id.asc())
+    if cursor:
+        # Keyset paging: seek past (last_name, id) of the previous page's last row.
+        last_name, last_id = decode_cursor(cursor, str, int)
+        stmt = stmt.where(tuple_(Professor.last_name, Professor.id) > (last_name, last_id))
+    else:
+        stmt = stmt.offset((page-1)*page_size)
+    return count_stmt, stmt.limit(page_size + 1)
+
+def professors_result(rows, total, page, page_size, cursor, fields=DEFAULT_PROFESSOR_FIELDS):
+    rows, next_cursor = split_page(rows, page_size, lambda r: (r.last_name, r.id))
+    return ProfessorPage(
+        total=total,
+        page=None if cursor else page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+        items=[
+            ProfessorSummary.model_validate(
+                {f: f"{r.first_name} {r.last_name}" if f == "name" else getattr(r, f) for f in fields}
+            ) for r in rows
+        ],
+    )
+
+def top_result(board, k, department=None):
+    """Top k of a school's leaderboard, or of one of its departments (name, case-insensitive)."""
+    if board is None:
+        raise HTTPException(status_code=404, detail="School not found")
+    department_id = None
+    if department is not None:
+        department_id = board.department_ids.get(department.strip().lower())
+        if department_id is None:
+            raise HTTPException(status_code=404, detail="Department not found")
+    return Leaderboard(
+        school_id=board.school_id,
+        department=board.department_names[department_id] if department is not None else None,
+        prior_mean=round(board.prior_mean, 4),
+        prior_weight=settings.RANKING_PRIOR_WEIGHT,
+        items=leaderboards.top(board, k, department_id, by_department=department is not None),
+    )
+
+# -----------------------------
+# Sync handlers
+# -----------------------------
+@router.get("/search")
+def search_schools(
+    request: Request,
+    state: str | None = None,            # "GA" or "Georgia"; anything else matches city
+    public_private: str | None = None,   # "public" | "private"
+    tuition_contains: str | None = None, # substring search in tuition_text
+    tuition_min: int | None = Query(default=None, ge=0),
+    tuition_max: int | None = Query(default=None, ge=0),
+    tuition_basis: Literal["in_state", "out_of_state"] = "in_state",
+    max_tuition: int | None = Query(default=None, ge=0, description="out-of-state tuition cap"),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from a previous page"),
+    include_total: bool = True,
+    fields: Optional[str] = Query(default=None, description="comma-separated item fields"),
+    db: Session = Depends(get_read_db),
+):
+    def build():
+        cols = parse_fields(fields, SCHOOL_FIELDS, SCHOOL_FIELDS)
+        count_stmt, stmt = search_statements(
+            state, public_private, tuition_contains, page, page_size, cursor, include_total,
+            tuition_min, tuition_max, tuition_basis, max_tuition, cols,
+        )
+        total = db.scalar(count_stmt) if count_stmt is not None else None
+        return search_result(db.execute(stmt).all(), total, page, page_size, cursor, cols)
+
+    return cached_json(request, ["schools"], build)
+
+@router.get("/facets")
+def school_facet_counts(
+    request: Request,
+    state: str | None = None,
+    public_private: str | None = None,
+    tuition: str | None = Query(default=None, description="tuition bucket key, e.g. 10k_20k"),
+    tuition_basis: Literal["in_state", "out_of_state"] = "in_state",
+    db: Session = Depends(get_read_db),
+):
+    """
+    Counts per state, public/private and tuition bucket for the current
+    filters, from the in-memory facet index. Declared before /{school_id}.
+    """
+    def build():
+        filters = facet_filters(state, public_private, tuition, tuition_basis)
+        school_facets.refresh(db)
+        return facets_result(filters)
+
+    return cached_json(request, ["schools"], build)
+
 @router.get("/{school_id}")
-def get_school(school_id: int, db: Session = Depends(get_db)):
-    return db.query(School).get(school_id)
+def get_school(school_id: int, request: Request, db: Session = Depends(get_read_db)):
+    return cached_json(
+        request, ["schools", f"school:{school_id}"], lambda: school_result(db.get(School, school_id))
+    )
 
 @router.get("/{school_id}/professors")
 def list_professors(
     school_id: int,
+    request: Request,
     level: Optional[str] = Query(default=None, description="UG or Grad"),
     department: Optional[str] = None,
     search: Optional[str] = None,
-    page: int = 1,
-    page_size: int = 20,
-    db: Session = Depends(get_db),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from a previous page"),
+    include_total: bool = True,
+    fields: Optional[str] = Query(default=None, description="comma-separated item fields"),
+    db: Session = Depends(get_read_db),
 ):
-    school = db.get(School, school_id)
-    if not school:
-        raise HTTPException(status_code=404, detail="School not found")
+    def build():
+        if db.scalar(school_exists_statement(school_id)) is None:
+            raise HTTPException(status_code=404, detail="School not found")
+        cols = parse_fields(fields, PROFESSOR_FIELDS, DEFAULT_PROFESSOR_FIELDS)
+        count_stmt, stmt = professors_statements(
+            school_id, level, department, search, page, page_size, cursor, include_total, cols
+        )
+        total = db.scalar(count_stmt) if count_stmt is not None else None
+        return professors_result(db.execute(stmt).all(), total, page, page_size, cursor, cols)
 
-    profs = (
-        db.query(Professor)
-        .filter(Professor.school_id == school_id)
-        .order_by(Professor.last_name.asc())
-        .all()
-    )
+    return cached_json(request, [f"school:{school_id}"], build)
+
+@router.get("/{school_id}/top", response_model=Leaderboard)
+def top_professors(school_id: int, k: int = Query(default=10, ge=1, le=100),
+                   db: Session = Depends(get_read_db)):
+    """Best-rated professors by Bayesian average, from the in-memory leaderboard."""
+    return top_result(leaderboards.board(db, school_id), k)
 
-    items = []
-    for p in profs:
-        dept = db.get(Department, p.department_id) if p.department_id else None
-        items.append(
-            {
-                "id": p.id,
-                "name": f"{p.first_name} {p.last_name}",
-                "department": dept.name if dept else None,
-                "level": p.level,
-                "email": p.email,
-                "rating": p.rating, 
-                "bio": p.bio,         
-                "school_id": p.school_id,
-            }
+@router.get("/{school_id}/departments/{department}/top", response_model=Leaderboard)
+def top_department_professors(school_id: int, department: str,
+                              k: int = Query(default=10, ge=1, le=100),
+                              db: Session = Depends(get_read_db)):
+    return top_result(leaderboards.board(db, school_id), k, department)
+
+# -----------------------------
+# Async handlers
+# -----------------------------
+@async_router.get("/search")
+async def search_schools_async(
+    request: Request,
+    state: str | None = None,
+    public_private: str | None = None,
+    tuition_contains: str | None = None,
+    tuition_min: int | None = Query(default=None, ge=0),
+    tuition_max: int | None = Query(default=None, ge=0),
+    tuition_basis: Literal["in_state", "out_of_state"] = "in_state",
+    max_tuition: int | None = Query(default=None, ge=0, description="out-of-state tuition cap"),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from a previous page"),
+    include_total: bool = True,
+    fields: Optional[str] = Query(default=None, description="comma-separated item fields"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    async def build():
+        cols = parse_fields(fields, SCHOOL_FIELDS, SCHOOL_FIELDS)
+        count_stmt, stmt = search_statements(
+            state, public_private, tuition_contains, page, page_size, cursor, include_total,
+            tuition_min, tuition_max, tuition_basis, max_tuition, cols,
         )
+        total = await db.scalar(count_stmt) if count_stmt is not None else None
+        return search_result((await db.execute(stmt)).all(), total, page, page_size, cursor, cols)
+
+    return await cached_json_async(request, ["schools"], build)
+
+@async_router.get("/facets")
+async def school_facet_counts_async(
+    request: Request,
+    state: str | None = None,
+    public_private: str | None = None,
+    tuition: str | None = Query(default=None, description="tuition bucket key, e.g. 10k_20k"),
+    tuition_basis: Literal["in_state", "out_of_state"] = "in_state",
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    async def build():
+        filters = facet_filters(state, public_private, tuition, tuition_basis)
+        await db.run_sync(school_facets.refresh)
+        return facets_result(filters)
+
+    return await cached_json_async(request, ["schools"], build)
+
+@async_router.get("/{school_id}")
+async def get_school_async(school_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    async def build():
+        return school_result(await db.get(School, school_id))
+
+    return await cached_json_async(request, ["schools", f"school:{school_id}"], build)
+
+@async_router.get("/{school_id}/professors")
+async def list_professors_async(
+    school_id: int,
+    request: Request,
+    level: Optional[str] = Query(default=None, description="UG or Grad"),
+    department: Optional[str] = None,
+    search: Optional[str] = None,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from a previous page"),
+    include_total: bool = True,
+    fields: Optional[str] = Query(default=None, description="comma-separated item fields"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    async def build():
+        if await db.scalar(school_exists_statement(school_id)) is None:
+            raise HTTPException(status_code=404, detail="School not found")
+        cols = parse_fields(fields, PROFESSOR_FIELDS, DEFAULT_PROFESSOR_FIELDS)
+        count_stmt, stmt = professors_statements(
+            school_id, level, department, search, page, page_size, cursor, include_total, cols
+        )
+        total = await db.scalar(count_stmt) if count_stmt is not None else None
+        return professors_result((await db.execute(stmt)).all(), total, page, page_size, cursor, cols)
+
+    return await cached_json_async(request, [f"school:{school_id}"], build)
+
+@async_router.get("/{school_id}/top", response_model=Leaderboard)
+async def top_professors_async(school_id: int, k: int = Query(default=10, ge=1, le=100),
+                               db: AsyncSession = Depends(get_async_read_db)):
+    return top_result(await db.run_sync(leaderboards.board, school_id), k)
 
-    return {"items": items}
+@async_router.get("/{school_id}/departments/{department}/top", response_model=Leaderboard)
+async def top_department_professors_async(school_id: int, department: str,
+                                          k: int = Query(default=10, ge=1, le=100),
+                                          db: AsyncSession = Depends(get_async_read_db)):
+    return top_result(await db.run_sync(leaderboards.board, school_id), k, department)
@@ -0,0 +1,15 @@
+from .db import SessionLocal
+from .migrate import init_db
+from .utils.ratings import rebuild_stats
+
+init_db()
+
+
+def main():
+    with SessionLocal() as db:
+        n = rebuild_stats(db)
+    print(f"✔ Rebuilt rating aggregates for {n} professors")
+
+
+if __name__ == "__main__":
+    main()
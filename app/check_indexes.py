@@ -0,0 +1,82 @@
+"""
+EXPLAIN every hot endpoint query and fail if any of them scans a whole table.
+
+    python -m app.check_indexes
+
+Run it after schema or query changes; it exits non-zero and prints the
+plan of each offending statement.
+"""
+import sys
+
+from sqlalchemy import select
+
+from .api.endpoints.professors import professor_statement, ratings_statement
+from .api.endpoints.schools import professors_statements, search_statements
+from .db import engine
+from .migrate import init_db
+from .models.models import School
+
+
+def endpoint_statements() -> list[tuple[str, object]]:
+    """(label, statement) for each query shape the catalog endpoints issue."""
+    statements = []
+
+    count, page = professors_statements(1, None, None, None, 1, 20, None, True)
+    statements += [("/schools/{id}/professors count", count), ("/schools/{id}/professors page", page)]
+    count, page = professors_statements(1, None, "Computer Science", None, 1, 20, None, True)
+    statements += [("/schools/{id}/professors?department= page", page)]
+    _, page = professors_statements(1, None, None, None, 1, 20, "WyJBIiwxXQ", False)
+    statements += [("/schools/{id}/professors?cursor= page", page)]
+
+    count, page = search_statements(None, "Public", None, 1, 20, None, True)
+    statements += [("/schools/search?public_private= count", count),
+                   ("/schools/search?public_private= page", page)]
+    count, _ = search_statements("Georgia", None, None, 1, 20, None, True)
+    statements += [("/schools/search?state= count", count)]
+    count, _ = search_statements(None, None, None, 1, 20, None, True, tuition_min=10000, tuition_max=20000)
+    statements += [("/schools/search?tuition_min=&tuition_max= count", count)]
+    count, _ = search_statements(None, None, None, 1, 20, None, True, max_tuition=30000)
+    statements += [("/schools/search?max_tuition= count", count)]
+
+    statements += [
+        ("/schools/{id}", select(School).where(School.id == 1)),
+        ("/professors/{id}", professor_statement(1)),
+        ("/professors/{id}/ratings", ratings_statement(1, 50, 0)),
+    ]
+    return statements
+
+
+def explain(conn, stmt) -> list[str]:
+    compiled = stmt.compile(dialect=conn.dialect)
+    if conn.dialect.name == "sqlite":
+        params = tuple(compiled.params[k] for k in compiled.positiontup)
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        return [r[-1] for r in rows]
+    rows = conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).all()
+    return [r[0] for r in rows]
+
+
+def full_scans(plan: list[str], dialect: str) -> list[str]:
+    if dialect == "sqlite":
+        # "SCAN t" is a full scan; "SCAN t USING [COVERING] INDEX" / "SEARCH" are not
+        return [line for line in plan if line.startswith("SCAN ") and " INDEX " not in f"{line} "]
+    return [line for line in plan if "Seq Scan" in line]
+
+
+def main() -> int:
+    init_db()
+    failed = 0
+    with engine.connect() as conn:
+        for label, stmt in endpoint_statements():
+            plan = explain(conn, stmt)
+            scans = full_scans(plan, conn.dialect.name)
+            print(f"{'✘' if scans else '✔'} {label}")
+            if scans:
+                failed += 1
+                for line in plan:
+                    print(f"    {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,84 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALLOWED_EMAIL_DOMAIN: str = "gsu.edu"
 
+    # per-process caches in front of jwt.decode and the User lookup
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+    AUTH_USER_CACHE_SIZE: int = 4096
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+
+    # bcrypt work factor; stored hashes with another cost are rehashed on login
+    BCRYPT_ROUNDS: int = 12
+    # processes for hashing/verification (0 = use the event loop's thread executor)
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # read replicas, comma-separated URLs; GET routes read from them round-robin
+    DATABASE_REPLICA_URLS: str = ""
+    # a replica that failed to connect is skipped for this long
+    REPLICA_RETRY_SECONDS: int = 30
+    # after a successful write, that client reads from the primary this long
+    REPLICA_STICKY_SECONDS: int = 5
+
+    # write-behind ratings: POSTs are queued (202) and flushed in batches,
+    # one commit per batch; a full queue answers 503
+    RATINGS_WRITE_BEHIND: bool = False
+    RATINGS_QUEUE_SIZE: int = 10000
+    RATINGS_FLUSH_BATCH: int = 1000
+    RATINGS_FLUSH_MAX_DELAY_MS: int = 50
+
+    # /schools/{id}/top: Bayesian average (C * m + sum) / (C + count) with
+    # C = RANKING_PRIOR_WEIGHT and m = RANKING_PRIOR_MEAN (0 = mean of all ratings)
+    RANKING_PRIOR_WEIGHT: int = 5
+    RANKING_PRIOR_MEAN: float = 0.0
+    RANKING_MIN_RATINGS: int = 1
+    RANKING_MAX_SCHOOLS: int = 1000
+
+    # connection pool (Postgres and SQLite files)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # serve catalog/ratings routes from async handlers on an AsyncSession
+    # (needs aiosqlite or asyncpg installed)
+    DB_ASYNC: bool = False
+
+    # SQLite tuning, applied on every new connection
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -65536     # negative = KiB, i.e. 64 MiB
+    SQLITE_MMAP_SIZE: int = 268435456   # 256 MiB
+
+    # background imports
+    IMPORT_DIR: str = "./imports"
+    IMPORT_WORKERS: int = 2
+    # a running job whose worker hasn't checkpointed for this long is resumed elsewhere
+    IMPORT_JOB_LEASE_SECONDS: int = 300
+
+    # per-route request/SQL metrics at /metrics
+    METRICS_ENABLED: bool = True
+    # log statements slower than this (0 = off), with EXPLAIN for SELECTs
+    SLOW_QUERY_MS: int = 0
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # request profiling (off by default): with PROFILE_ALLOW_HEADER admins may send
+    # `X-Profile: 1`, and/or a random share of requests is sampled; results land in
+    # PROFILE_DIR ("speedscope" or "collapsed"), listed at /admin/profiles (admins only)
+    PROFILE_ALLOW_HEADER: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: int = 2
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_FORMAT: str = "speedscope"
+
+    # response cache ("memory" or "redis")
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_HTTP_MAX_AGE: int = 0
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 settings = Settings()
@@ -1,23 +1,193 @@
-import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from contextvars import ContextVar
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+from app.core.config import settings
+from app.utils import metrics
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    future=True,
-    connect_args=connect_args,
-)
+DATABASE_URL = settings.DATABASE_URL
+
+
+class PoolMetrics:
+    """Counters for connection pool activity, fed by InstrumentedQueuePool and pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def on_connect(self, *_):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *_):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def on_checkin(self, *_):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "avg_wait_ms": round(1000 * self.wait_seconds_total / self.checkouts, 3)
+                if self.checkouts else 0.0,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _sqlite_pragmas(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    if settings.SQLITE_WAL:
+        # readers no longer block the writer (and vice versa)
+        cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cur.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cur.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cur.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cur.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    metrics.record_query(seconds)
+    if not executemany:
+        metrics.log_slow_query(conn, statement, parameters, seconds, explain_statement)
+
+
+def _on_error(ctx):
+    # a failed statement never reaches after_cursor_execute
+    starts = ctx.connection.info.get("query_start") if ctx.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def explain_statement(conn, statement: str, parameters) -> list[str]:
+    """Plan of an already-compiled statement, on a fresh cursor of the same connection."""
+    is_sqlite = conn.dialect.name == "sqlite"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(("EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN ") + statement, parameters)
+        return [row[-1] if is_sqlite else row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def instrument_engine(eng: Engine) -> None:
+    """Feed statement counts, SQL time and pool checkouts to app.utils.metrics."""
+    if not settings.METRICS_ENABLED:
+        return
+    event.listen(eng, "before_cursor_execute", _before_cursor_execute)
+    event.listen(eng, "after_cursor_execute", _after_cursor_execute)
+    event.listen(eng, "handle_error", _on_error)
+    event.listen(eng, "checkout", lambda *_: metrics.record_checkout())
+
+
+def make_engine(url: str | None = None, **overrides) -> Engine:
+    """
+    Build an engine tuned from Settings: pool sizing/recycle/pre-ping for
+    server databases, WAL + pragmas for SQLite files. Pool activity is
+    available as engine.pool.metrics.
+    """
+    url = url or DATABASE_URL
+    is_sqlite = url.startswith("sqlite")
+    in_memory = is_sqlite and (":memory:" in url or url.rstrip("/") in ("sqlite:", "sqlite:/"))
+
+    kwargs = {"echo": False, "future": True}
+    if is_sqlite:
+        # busy_timeout is also set by pragma; timeout= covers the connect itself
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    if not in_memory:
+        kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING and not is_sqlite,
+        )
+    kwargs.update(overrides)
+
+    eng = create_engine(url, **kwargs)
+
+    metrics = PoolMetrics()
+    eng.pool.metrics = metrics
+    event.listen(eng, "connect", metrics.on_connect)
+    event.listen(eng, "checkout", metrics.on_checkout)
+    event.listen(eng, "checkin", metrics.on_checkin)
+    if is_sqlite:
+        event.listen(eng, "connect", _sqlite_pragmas)
+    instrument_engine(eng)
+    return eng
+
+
+def pool_stats(eng: Engine | None = None) -> dict:
+    eng = eng or engine
+    stats = dict(eng.pool.metrics.snapshot())
+    if isinstance(eng.pool, QueuePool):
+        stats.update(
+            pool_size=eng.pool.size(),
+            checked_out=eng.pool.checkedout(),
+            overflow=eng.pool.overflow(),
+        )
+    return stats
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # ⭐ Base used by all models
 Base = declarative_base()
-# FastAPI dependency to get a DB session
+# FastAPI dependency to get a DB session (always the primary; use for writes)
 def get_db():
     db = SessionLocal()
     try:
@@ -25,3 +195,239 @@ def get_db():
     finally:
         db.close()
 
+
+# -----------------------------
+# Read replicas (DATABASE_REPLICA_URLS)
+# -----------------------------
+REPLICA_URLS = [u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+
+class ReplicaSet:
+    """
+    Round-robin over replica engines. An engine whose connection fails is
+    skipped for REPLICA_RETRY_SECONDS; with none left, pick() returns None
+    and callers read from the primary.
+    """
+
+    def __init__(self, engines: list):
+        self.engines = engines
+        self._down_until = [0.0] * len(engines)
+        self._next = 0
+        self._lock = threading.Lock()
+        for i, eng in enumerate(engines):
+            event.listen(eng, "handle_error", self._on_error(i))
+
+    def _on_error(self, index: int):
+        def handle_error(ctx):
+            # no connection yet (connect failed) or the connection died
+            if ctx.connection is None or ctx.is_disconnect:
+                self.mark_down(index)
+        return handle_error
+
+    def mark_down(self, index: int) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    def _next_up(self) -> int | None:
+        with self._lock:
+            now = time.monotonic()
+            for _ in range(len(self.engines)):
+                i = self._next
+                self._next = (self._next + 1) % len(self.engines)
+                if self._down_until[i] <= now:
+                    return i
+        return None
+
+    def pick(self):
+        """The next replica that hands out a connection, or None."""
+        for _ in range(len(self.engines)):
+            i = self._next_up()
+            if i is None:
+                return None
+            try:
+                # a pool checkout; only opens a new connection when the pool is empty
+                self.engines[i].connect().close()
+            except Exception:
+                self.mark_down(i)
+                continue
+            return self.engines[i]
+        return None
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {"url": eng.url.render_as_string(hide_password=True), "up": until <= now}
+            for eng, until in zip(self.engines, self._down_until)
+        ]
+
+
+# Per-request routing state, set by the middleware in app.main. A dict
+# so flags set while handling the request (e.g. on commit) are seen by
+# every session the request opens, whichever thread runs it.
+_routing: ContextVar[dict | None] = ContextVar("db_routing", default=None)
+
+
+def begin_request_routing(read_primary: bool):
+    return _routing.set({"primary": read_primary})
+
+
+def end_request_routing(token) -> bool:
+    """Reset the request's state; True if the request committed a write."""
+    state = _routing.get()
+    _routing.reset(token)
+    return bool(state and state.get("wrote"))
+
+
+def reads_use_primary() -> bool:
+    state = _routing.get()
+    return bool(state and state.get("primary"))
+
+
+@event.listens_for(Session, "after_commit")
+def _stick_to_primary(session):
+    # read-your-writes: once this request commits, its later reads go to the primary
+    if not isinstance(session, RoutingSession) or session._wrote:
+        state = _routing.get()
+        if state is not None:
+            state["primary"] = state["wrote"] = True
+
+
+class RoutingSession(Session):
+    """
+    Session for read paths: queries go to one replica (picked once per
+    session), while flushes, and anything after a write in this session
+    or request, go to the primary.
+    """
+
+    def __init__(self, primary=None, replicas: ReplicaSet | None = None, **kw):
+        super().__init__(**kw)
+        self._primary = primary or engine
+        self._replicas = replicas
+        self._replica = None
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or self._wrote or not self._replicas or reads_use_primary():
+            if self._flushing:
+                self._wrote = True
+            return self._primary
+        if self._replica is None:
+            self._replica = self._replicas.pick() or self._primary
+        return self._replica
+
+
+replicas = ReplicaSet([make_engine(u) for u in REPLICA_URLS]) if REPLICA_URLS else None
+
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, replicas=replicas
+)
+
+
+# FastAPI dependency for read-only routes: a replica when configured
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# -----------------------------
+# Optional async stack (DB_ASYNC=true)
+# -----------------------------
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def async_url(url: str) -> str:
+    """sqlite:/// -> sqlite+aiosqlite:///, postgresql:// -> postgresql+asyncpg://"""
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme:
+        scheme = scheme.split("+", 1)[0]
+    driver = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg",
+              "postgres": "postgresql+asyncpg"}.get(scheme, scheme)
+    return driver + sep + rest
+
+
+def make_async_engine(url: str | None = None):
+    """
+    Async counterpart of make_engine. Imported lazily so aiosqlite/asyncpg
+    are only needed when DB_ASYNC is on. SQLite pragmas are applied to the
+    underlying DBAPI connection the same way as for the sync engine.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_url(url or DATABASE_URL)
+    is_sqlite = url.startswith("sqlite")
+    kwargs = {"echo": False}
+    if is_sqlite:
+        kwargs["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if ":memory:" not in url:
+        kwargs.update(
+            # aiosqlite would otherwise default to NullPool (a new connection per checkout)
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING and not is_sqlite,
+        )
+    eng = create_async_engine(url, **kwargs)
+    if is_sqlite:
+        event.listen(eng.sync_engine, "connect", _sqlite_pragmas)
+    instrument_engine(eng.sync_engine)
+    return eng
+
+
+_async_replica_engines: list = []
+_AsyncReadSessionLocal = None
+
+
+def get_async_sessionmaker():
+    global _async_engine, _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = make_async_engine()
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _AsyncSessionLocal
+
+
+def get_async_read_sessionmaker():
+    """AsyncSessions whose sync side is a RoutingSession over async replica engines."""
+    global _async_replica_engines, _AsyncReadSessionLocal
+    if _AsyncReadSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        get_async_sessionmaker()
+        _async_replica_engines = [make_async_engine(u) for u in REPLICA_URLS]
+        async_replicas = (
+            ReplicaSet([e.sync_engine for e in _async_replica_engines]) if REPLICA_URLS else None
+        )
+        _AsyncReadSessionLocal = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, sync_session_class=RoutingSession,
+            primary=_async_engine.sync_engine, replicas=async_replicas,
+        )
+    return _AsyncReadSessionLocal
+
+
+# FastAPI dependency to get an AsyncSession (primary; use for writes)
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+# FastAPI dependency for read-only async routes
+async def get_async_read_db():
+    async with get_async_read_sessionmaker()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    global _async_engine, _AsyncSessionLocal, _async_replica_engines, _AsyncReadSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    for eng in _async_replica_engines:
+        await eng.dispose()
+    _async_engine = _AsyncSessionLocal = _AsyncReadSessionLocal = None
+    _async_replica_engines = []
@@ -0,0 +1,159 @@
+"""
+Streaming exports of professors and ratings, shared by /export/* and the CLI.
+
+    python -m app.export professors|ratings [--format csv|ndjson] [--gzip]
+                         [--school-id N] [--updated-since 2026-01-01T00:00:00]
+                         [-o FILE]
+
+Rows are read with yield_per (a server-side cursor on Postgres, stepwise
+fetching on SQLite) and encoded one partition at a time, so memory stays
+flat however many rows are exported. CSV headers match what the seeders
+read: a professors export loads back with `python -m app.seed schools.csv
+professors.csv`, and a ratings export with `--ratings ratings.csv`.
+Extra columns (id, updated_at) are ignored on the way in.
+"""
+import argparse
+import csv
+import datetime
+import io
+import sys
+import zlib
+from typing import Iterator
+
+import orjson
+from sqlalchemy import String, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.models import Department, Professor, Rating
+
+PARTITION_ROWS = 1000
+FORMATS = {"ndjson": ("application/x-ndjson", "ndjson"), "csv": ("text/csv; charset=utf-8", "csv")}
+
+
+def _since(db: Session, column, value: datetime.datetime):
+    """
+    column >= value, compared in UTC. SQLite keeps naive UTC text, either
+    CURRENT_TIMESTAMP's 'YYYY-MM-DD HH:MM:SS' or SQLAlchemy's with
+    '.ffffff', so the bound is sent as text in that format, truncated to
+    the second: rows stamped within the boundary second are exported
+    again rather than missed.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    if db.get_bind().dialect.name != "sqlite":
+        return column >= value
+    return column >= literal(value.strftime("%Y-%m-%d %H:%M:%S"), String)
+
+
+def professors_statement(db: Session, school_id: int | None = None,
+                         updated_since: datetime.datetime | None = None):
+    stmt = (
+        select(
+            Professor.id, Professor.school_id, Professor.first_name, Professor.last_name,
+            Department.name.label("department"), Professor.level, Professor.email,
+            Professor.rating, Professor.bio, Professor.photo_url, Professor.profile_url,
+            Professor.updated_at,
+        )
+        .outerjoin(Department, Professor.department_id == Department.id)
+    )
+    if school_id is not None:
+        stmt = stmt.where(Professor.school_id == school_id)
+    if updated_since is not None:
+        stmt = stmt.where(_since(db, Professor.updated_at, updated_since))
+    return stmt.order_by(Professor.id)
+
+
+def ratings_statement(db: Session, school_id: int | None = None,
+                      updated_since: datetime.datetime | None = None):
+    # ratings are never edited, so created_at is their updated_at
+    stmt = select(Rating.id, Rating.professor_id, Rating.user_id, Rating.stars, Rating.comment,
+                  Rating.created_at)
+    if school_id is not None:
+        stmt = stmt.join(Professor, Rating.professor_id == Professor.id).where(Professor.school_id == school_id)
+    if updated_since is not None:
+        stmt = stmt.where(_since(db, Rating.created_at, updated_since))
+    return stmt.order_by(Rating.id)
+
+
+STATEMENTS = {"professors": professors_statement, "ratings": ratings_statement}
+
+
+# -----------------------------
+# ENCODING
+# -----------------------------
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows, header: list[str] | None = None) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(header)
+    writer.writerows([_csv_value(v) for v in row] for row in rows)
+    return buf.getvalue().encode("utf-8")
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
+
+
+def export_chunks(db: Session, kind: str, fmt: str, school_id: int | None = None,
+                  updated_since: datetime.datetime | None = None) -> Iterator[bytes]:
+    """Encoded chunks of PARTITION_ROWS rows each; the CSV header comes with the first."""
+    stmt = STATEMENTS[kind](db, school_id, updated_since).execution_options(yield_per=PARTITION_ROWS)
+    result = db.execute(stmt)
+    header = list(result.keys()) if fmt == "csv" else None
+    for rows in result.partitions():
+        yield _csv_chunk(rows, header) if fmt == "csv" else _ndjson_chunk(rows)
+        header = None
+    if header:
+        yield _csv_chunk([], header)   # no rows: still a valid CSV
+
+
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly."""
+    z = zlib.compressobj(6, zlib.DEFLATED, 31)   # wbits 31 = gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+
+# -----------------------------
+# MAIN ENTRY POINT
+# -----------------------------
+def main():
+    from .db import ReadSessionLocal
+    from .migrate import init_db
+
+    parser = argparse.ArgumentParser(description="Stream professors or ratings as CSV or NDJSON.")
+    parser.add_argument("kind", choices=STATEMENTS)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--gzip", action="store_true", help="implied by an -o ending in .gz")
+    parser.add_argument("--school-id", type=int)
+    parser.add_argument("--updated-since", type=datetime.datetime.fromisoformat)
+    parser.add_argument("-o", "--output", help="file to write (default stdout)")
+    args = parser.parse_args()
+
+    init_db()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        with ReadSessionLocal() as db:
+            chunks = export_chunks(db, args.kind, args.format, args.school_id, args.updated_since)
+            if args.gzip or (args.output or "").endswith(".gz"):
+                chunks = gzip_chunks(chunks)
+            for chunk in chunks:
+                out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Set-based CSV ingestion shared by the seed scripts and /admin/seed.
+
+Departments for a whole file are resolved in one pre-pass, then rows are
+inserted in executemany batches inside a single transaction.
+"""
+import csv
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.models import Department, Professor, Rating, School
+from app.utils.cache import invalidate_all
+from app.utils.facets import school_facets
+from app.utils.geo import parse_tuition, to_state_code
+from app.utils.ratings import apply_ratings
+
+BATCH_SIZE = 1000
+
+RowSource = Callable[[], Iterable[dict]]
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.rows} rows in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+
+
+# -----------------------------
+# ROW PARSING
+# -----------------------------
+def _first(row: dict, *keys: str) -> str:
+    for k in keys:
+        v = row.get(k)
+        if v:
+            return v.strip()
+    return ""
+
+
+def _clean(value: str | None) -> str | None:
+    return value.strip() if value else None
+
+
+def parse_rating(value: str | None) -> float | None:
+    if value in ("", "N/A", None):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_school_id(row: dict) -> int:
+    raw = _first(row, "school_id", "School_id", "School ID", "college_id", "College_id")
+    if not raw:
+        raise ValueError(f"Missing school_id in row: {row}")
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Invalid school_id value: {raw}")
+
+
+def department_name(row: dict) -> str:
+    return _first(row, "department", "Department")
+
+
+def professor_values(
+    row: dict,
+    school_id: int | None = None,
+    normalize_level: Optional[Callable[[str | None], str | None]] = None,
+) -> dict:
+    """
+    Map a professor CSV row (flexible header spellings) to Professor column values.
+    department_id is filled in later from the pre-pass map.
+    """
+    level = _first(row, "level", "Level") or None
+    return {
+        "school_id": school_id if school_id is not None else parse_school_id(row),
+        "first_name": _first(row, "first_name", "Firstname", "First name", "First Name"),
+        "last_name": _first(row, "last_name", "Lastname", "Last name", "Last Name"),
+        "level": normalize_level(level) if normalize_level else level,
+        "email": _clean(row.get("email") or row.get("emailid") or row.get("Email")),
+        "bio": _clean(row.get("bio") or row.get("Bio")),
+        "rating": parse_rating(row.get("rating") or row.get("Rating")),
+        "photo_url": _clean(row.get("photo_url")),
+        "profile_url": _clean(row.get("profile_url")),
+    }
+
+
+def school_values(row: dict) -> dict:
+    """Map a data/schools.csv row to School column values."""
+    city_state = row["City, State"]
+    if "," in city_state:
+        city, state = [x.strip() for x in city_state.split(",", 1)]
+    else:
+        city, state = city_state, ""
+    tuition = row["Tuition & Fees (approx.)"]
+    in_state, out_of_state = parse_tuition(tuition)
+    return {
+        "id": int(row["id"]),
+        "name": row["College Name"],
+        "city": city,
+        "state": state,
+        "public_private": row["Type"],
+        "tuition_text": tuition,
+        "state_code": to_state_code(state),
+        "tuition_in_state": in_state,
+        "tuition_out_of_state": out_of_state,
+    }
+
+
+def rating_values(row: dict, now: datetime.datetime) -> dict:
+    """Map a ratings CSV row (as written by app.export) to Rating column values."""
+    stars = int(row["stars"])
+    if not 1 <= stars <= 5:
+        raise ValueError(f"stars must be 1-5: {row}")
+    user_id = _clean(row.get("user_id"))
+    created_at = _clean(row.get("created_at"))
+    return {
+        "professor_id": int(row["professor_id"]),
+        "stars": stars,
+        "comment": _clean(row.get("comment")),
+        "user_id": int(user_id) if user_id else None,
+        "created_at": datetime.datetime.fromisoformat(created_at) if created_at else now,
+    }
+
+
+def csv_rows(path: str, errors: str = "strict") -> RowSource:
+    """A re-iterable row source over a CSV file (each call reopens it)."""
+    def rows() -> Iterator[dict]:
+        with open(path, newline="", encoding="utf-8", errors=errors) as f:
+            yield from csv.DictReader(f)
+    return rows
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# -----------------------------
+# DEPARTMENTS
+# -----------------------------
+def resolve_departments(db: Session, keys: set[tuple[int, str]]) -> dict[tuple[int, str], int]:
+    """
+    Map every (school_id, department name) to a department id, creating the
+    missing ones with one batched insert. Does not commit.
+    """
+    if not keys:
+        return {}
+    school_ids = {sid for sid, _ in keys}
+
+    def existing() -> dict[tuple[int, str], int]:
+        rows = db.execute(
+            select(Department.school_id, Department.name, Department.id)
+            .where(Department.school_id.in_(school_ids))
+        )
+        return {(sid, name): did for sid, name, did in rows}
+
+    found = existing()
+    missing = keys - found.keys()
+    if missing:
+        db.execute(
+            insert(Department),
+            [{"school_id": sid, "name": name} for sid, name in sorted(missing)],
+        )
+        found = existing()
+    return found
+
+
+# -----------------------------
+# INGESTION
+# -----------------------------
+def ingest_professors(
+    db: Session,
+    rows: RowSource,
+    school_id: int | None = None,
+    normalize_level: Optional[Callable[[str | None], str | None]] = None,
+    batch_size: int = BATCH_SIZE,
+    commit: bool = True,
+    on_batch: Optional[Callable[[IngestStats], None]] = None,
+    skip_rows: int = 0,
+    commit_each_batch: bool = False,
+) -> IngestStats:
+    """
+    Insert professors from a row source in two streaming passes:
+    1) collect (school_id, department) pairs and resolve them all at once,
+    2) insert professors in batches of batch_size.
+    By default everything runs in one transaction; pass school_id to override
+    the per-row school_id column. on_batch is called after every inserted
+    batch, before commit_each_batch commits it, so a checkpoint written there
+    lands atomically with the rows. skip_rows resumes after that checkpoint.
+    """
+    start = time.perf_counter()
+
+    keys = set()
+    for row in rows():
+        name = department_name(row)
+        if name:
+            keys.add((school_id if school_id is not None else parse_school_id(row), name))
+    dept_ids = resolve_departments(db, keys)
+
+    stats = IngestStats()
+
+    def values() -> Iterator[dict]:
+        for i, row in enumerate(rows()):
+            if i < skip_rows:
+                continue
+            v = professor_values(row, school_id=school_id, normalize_level=normalize_level)
+            name = department_name(row)
+            v["department_id"] = dept_ids[(v["school_id"], name)] if name else None
+            yield v
+
+    for batch in _batched(values(), batch_size):
+        db.execute(insert(Professor), batch)
+        stats.rows += len(batch)
+        if on_batch:
+            stats.seconds = time.perf_counter() - start
+            on_batch(stats)
+        if commit_each_batch:
+            db.commit()
+            invalidate_all()
+
+    if commit:
+        db.commit()
+        invalidate_all()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def ingest_schools(db: Session, rows: RowSource, commit: bool = True) -> IngestStats:
+    """Upsert schools by id: new ids are bulk inserted, known ids bulk updated."""
+    start = time.perf_counter()
+    known = set(db.scalars(select(School.id)))
+    stats = IngestStats()
+    written = []
+
+    for batch in _batched((school_values(r) for r in rows()), BATCH_SIZE):
+        new = [v for v in batch if v["id"] not in known]
+        old = [v for v in batch if v["id"] in known]
+        if new:
+            db.execute(insert(School), new)
+            known.update(v["id"] for v in new)
+        if old:
+            db.execute(update(School), old)
+        stats.rows += len(batch)
+        written += batch
+
+    if commit:
+        db.commit()
+        school_facets.upsert(written)
+        invalidate_all()
+        school_facets.mark_current()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def ingest_ratings(db: Session, rows: RowSource, batch_size: int = BATCH_SIZE,
+                   commit: bool = True) -> IngestStats:
+    """Insert ratings in executemany batches, folding each batch into the aggregates."""
+    start = time.perf_counter()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    stats = IngestStats()
+    for batch in _batched((rating_values(r, now) for r in rows()), batch_size):
+        db.execute(insert(Rating), batch)
+        apply_ratings(db, [(v["professor_id"], v["stars"]) for v in batch])
+        stats.rows += len(batch)
+    if commit:
+        db.commit()
+        invalidate_all()
+    stats.seconds = time.perf_counter() - start
+    return stats
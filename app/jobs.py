@@ -0,0 +1,221 @@
+"""
+Background CSV import jobs.
+
+Job state lives in the import_jobs table. Each batch of professors is
+committed together with the job's rows_done counter, so after a crash a
+job is resumed from its last committed batch instead of starting over.
+
+A worker runs a job only after claiming it: one conditional UPDATE sets
+status, owner and heartbeat if the job is queued or its lease has
+expired. Every batch refreshes the heartbeat, again conditional on the
+owner, so a worker that lost its lease stops instead of importing rows
+a second time.
+"""
+import datetime
+import os
+import socket
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import SessionLocal, engine
+from app.ingest import IngestStats, csv_rows, ingest_professors
+from app.models.models import ImportJob
+
+_thread_pool: ThreadPoolExecutor | None = None
+
+
+def job_to_dict(job: ImportJob) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "filename": job.filename,
+        "school_id": job.school_id,
+        "status": job.status,
+        "rows_done": job.rows_done,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def create_job(
+    db: Session,
+    path: str,
+    school_id: int | None = None,
+    filename: str | None = None,
+    delete_when_done: bool = False,
+) -> ImportJob:
+    job = ImportJob(
+        id=uuid.uuid4().hex,
+        kind="professors",
+        path=path,
+        filename=filename or os.path.basename(path),
+        school_id=school_id,
+        status="queued",
+        rows_done=0,
+        delete_when_done=delete_when_done,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def store_upload_path(job_name: str) -> str:
+    """Where an uploaded CSV is kept until its job finishes (survives restarts)."""
+    os.makedirs(settings.IMPORT_DIR, exist_ok=True)
+    return os.path.join(settings.IMPORT_DIR, f"{job_name}.csv")
+
+
+class LeaseLost(Exception):
+    """Another worker took the job over; this one must stop."""
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _lease_expired():
+    cutoff = _now() - datetime.timedelta(seconds=settings.IMPORT_JOB_LEASE_SECONDS)
+    return and_(ImportJob.status == "running",
+                or_(ImportJob.heartbeat.is_(None), ImportJob.heartbeat < cutoff))
+
+
+def claim_job(db: Session, job_id: str, owner: str) -> bool:
+    """Take a queued job, or a running one whose lease expired. Commits."""
+    claimed = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, or_(ImportJob.status == "queued", _lease_expired()))
+        .values(status="running", owner=owner, heartbeat=_now(), error=None)
+    ).rowcount
+    db.commit()
+    return claimed == 1
+
+
+def _owned_update(db: Session, job_id: str, owner: str, **values) -> None:
+    """Update the job only while `owner` still holds it."""
+    if db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.owner == owner, ImportJob.status == "running")
+        .values(**values)
+    ).rowcount != 1:
+        raise LeaseLost(job_id)
+
+
+def run_job(job_id: str) -> dict:
+    """
+    Run (or resume) one import job to completion. Safe to call in a worker
+    thread or process: it opens its own session. A job another worker
+    holds is left alone and returned as it stands.
+    """
+    owner = _worker_id()
+    with SessionLocal() as db:
+        if not claim_job(db, job_id, owner):
+            job = db.get(ImportJob, job_id)
+            return job_to_dict(job) if job else {"job_id": job_id, "status": "missing"}
+
+        job = db.get(ImportJob, job_id)
+        path, school_id, resume_from = job.path, job.school_id, job.rows_done
+
+        def checkpoint(stats: IngestStats):
+            # flushed with the batch it describes; committed right after it
+            _owned_update(db, job_id, owner, rows_done=resume_from + stats.rows, heartbeat=_now())
+
+        try:
+            ingest_professors(
+                db,
+                csv_rows(path, errors="ignore"),
+                school_id=school_id,
+                on_batch=checkpoint,
+                skip_rows=resume_from,
+                commit_each_batch=True,
+            )
+            _owned_update(db, job_id, owner, status="done", heartbeat=_now())
+            db.commit()
+        except LeaseLost:
+            db.rollback()
+            return job_to_dict(db.get(ImportJob, job_id))
+        except Exception as e:
+            db.rollback()
+            try:
+                _owned_update(db, job_id, owner, status="failed", error=str(e))
+                db.commit()
+            except LeaseLost:
+                db.rollback()
+            return job_to_dict(db.get(ImportJob, job_id))
+
+        job = db.get(ImportJob, job_id)
+        if job.delete_when_done and os.path.exists(job.path):
+            os.unlink(job.path)
+        return job_to_dict(job)
+
+
+def requeue_job(db: Session, job_id: str) -> bool:
+    """failed -> queued in one conditional UPDATE; False if the job isn't failed. Commits."""
+    requeued = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == "failed")
+        .values(status="queued", owner=None, heartbeat=None)
+    ).rowcount
+    db.commit()
+    return requeued == 1
+
+
+def _thread_executor() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=settings.IMPORT_WORKERS, thread_name_prefix="import-job"
+        )
+    return _thread_pool
+
+
+def submit_job(job_id: str) -> None:
+    """Queue a job on the in-process thread pool (used by the API)."""
+    _thread_executor().submit(run_job, job_id)
+
+
+def _process_init():
+    # never reuse connections inherited from the parent process
+    engine.dispose(close=False)
+
+
+def run_jobs_parallel(job_ids: list[str], workers: int | None = None) -> list[dict]:
+    """
+    Run several jobs at once on a process pool, one file per worker, so CSV
+    parsing spreads across CPU cores. Blocks until all have finished.
+    """
+    workers = workers or min(len(job_ids), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_process_init) as executor:
+        return list(executor.map(run_job, job_ids))
+
+
+def resume_jobs() -> list[str]:
+    """
+    Requeue jobs that are queued, or running with an expired lease (their
+    worker stopped or crashed). Called once at startup; run_job's claim
+    keeps a job that another worker takes first from running twice.
+    """
+    with SessionLocal() as db:
+        ids = [
+            j.id
+            for j in db.query(ImportJob).filter(or_(ImportJob.status == "queued", _lease_expired()))
+        ]
+    for job_id in ids:
+        submit_job(job_id)
+    return ids
+
+
+def shutdown(wait: bool = False) -> None:
+    global _thread_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=wait, cancel_futures=not wait)
+        _thread_pool = None
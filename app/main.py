@@ -1,12 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
-from app.db import engine
-from app.models.base import Base
+from app.core.config import settings
+from app.db import (
+    REPLICA_URLS, begin_request_routing, dispose_async_engine, end_request_routing, pool_stats, replicas,
+)
+from app.migrate import init_db
+from app.utils import metrics, profiling
+from app.utils.rating_buffer import rating_buffer
+from app.utils.security import shutdown_hash_pool
+from app import jobs
 
+from app.api.endpoints.admin import router as admin_router
 from app.api.endpoints.auth import router as auth_router
-from app.api.endpoints.schools import router as schools_router
-from app.api.endpoints.professors import router as professors_router
+from app.api.endpoints import export, schools, professors
 
 
 # Create FastAPI app
@@ -14,8 +23,14 @@ app = FastAPI(
     title="RMP-Style API",
     version="0.1.0",
     description="Backend for Rate-My-Professor style project",
+    default_response_class=ORJSONResponse,
 )
 
+# Opt-in request profiling (X-Profile: 1 from an admin with PROFILE_ALLOW_HEADER, or PROFILE_SAMPLE_RATE).
+# Added first so it is the innermost middleware and shares the handler's task.
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 # CORS so your Next.js frontend (localhost:3000) can call the API
 app.add_middleware(
     CORSMiddleware,
@@ -26,10 +41,51 @@ app.add_middleware(
 )
 
 
-# Create all tables when the API starts
+# Per-route latency / SQL / response size metrics, served at /metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+# Read/write routing: only installed when DATABASE_REPLICA_URLS is set
+STICKY_COOKIE = "rmp_primary"
+
+if REPLICA_URLS:
+    @app.middleware("http")
+    async def route_reads(request: Request, call_next):
+        """
+        Reads go to replicas unless this client wrote within the last
+        REPLICA_STICKY_SECONDS (cookie), or this request already committed.
+        """
+        token = begin_request_routing(read_primary=STICKY_COOKIE in request.cookies)
+        try:
+            response = await call_next(request)
+        finally:
+            wrote = end_request_routing(token)
+        if wrote and settings.REPLICA_STICKY_SECONDS > 0:
+            response.set_cookie(
+                STICKY_COOKIE, "1", max_age=settings.REPLICA_STICKY_SECONDS, httponly=True, samesite="lax"
+            )
+        return response
+
+
+# Apply migrations when the API starts
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    init_db()
+    # pick up imports interrupted by the last shutdown or crash
+    jobs.resume_jobs()
+    if settings.RATINGS_WRITE_BEHIND:
+        rating_buffer.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # unfinished jobs stay queued/running in import_jobs and resume next start
+    jobs.shutdown(wait=False)
+    # commit every accepted rating before the engine goes away
+    await run_in_threadpool(rating_buffer.stop)
+    shutdown_hash_pool()
+    await dispose_async_engine()
 
 
 # Simple health-check endpoint
@@ -38,7 +94,46 @@ def health():
     return {"status": "ok"}
 
 
+# Connection pool checkout / wait counters
+@app.get("/health/pool")
+def health_pool():
+    stats = pool_stats()
+    if replicas is not None:
+        stats["replicas"] = [
+            {**r, **pool_stats(eng)} for r, eng in zip(replicas.stats(), replicas.engines)
+        ]
+    return stats
+
+
+# Write-behind rating queue depth and flush counters
+@app.get("/health/ratings")
+def health_ratings():
+    return rating_buffer.stats()
+
+
+# Prometheus text exposition of app.utils.metrics
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics_endpoint():
+        pools = {"primary": pool_stats()}
+        if replicas is not None:
+            for i, eng in enumerate(replicas.engines):
+                pools[f"replica{i}"] = pool_stats(eng)
+        return PlainTextResponse(metrics.render(pools), media_type="text/plain; version=0.0.4")
+
+
 # Register routers (each router already has its own prefix)
 app.include_router(auth_router)
-app.include_router(schools_router)
-app.include_router(professors_router)
+# DB_ASYNC switches the catalog + ratings routes to their async handlers
+if settings.DB_ASYNC:
+    app.include_router(schools.async_router)
+    app.include_router(professors.async_router)
+else:
+    app.include_router(schools.router)
+    app.include_router(professors.router)
+app.include_router(admin_router)
+app.include_router(export.router)
+
+# sync handlers run on the threadpool; let the profiler follow them there
+if profiling.enabled():
+    profiling.instrument_routes(app.routes)
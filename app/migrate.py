@@ -0,0 +1,36 @@
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config
+
+from .db import engine
+from .utils.search import ensure_search_index
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_config() -> Config:
+    cfg = Config(ALEMBIC_INI)
+    cfg.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    # leave the application's logging setup alone
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+def init_db():
+    """Bring the schema to the latest migration, then make sure the search index exists."""
+    command.upgrade(alembic_config(), "head")
+    ensure_search_index(engine)
+
+
+def main():
+    init_db()
+    print("✔ Database is at the latest migration")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print("Usage: python -m app.migrate   (or use `alembic` directly for other commands)")
+        sys.exit(1)
+    main()
@@ -1,3 +1,2 @@
-from sqlalchemy.orm import declarative_base
-
-Base = declarative_base()
+# Single declarative Base shared with app.db so create_all sees every model.
+from app.db import Base  # noqa: F401
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     DateTime,
+    Index,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -29,6 +30,18 @@ class School(Base):
     # Full text like '$9,286 (in–state), $24,517 (out–of–state)'
     tuition_text: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
+    # parsed from state / tuition_text at ingest, for exact and range filters
+    state_code: Mapped[str | None] = mapped_column(String(2), nullable=True)
+    tuition_in_state: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    tuition_out_of_state: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_schools_state", "state"),
+        Index("ix_schools_state_code", "state_code"),
+        Index("ix_schools_tuition_in_state", "tuition_in_state"),
+        Index("ix_schools_tuition_out_of_state", "tuition_out_of_state"),
+    )
+
     # relationships
     departments = relationship(
         "Department",
@@ -42,6 +55,10 @@ class School(Base):
     )
 
 
+# /schools/search filters public_private with a case-insensitive exact match
+Index("ix_schools_public_private_lower", func.lower(School.public_private))
+
+
 class Department(Base):
     __tablename__ = "departments"
 
@@ -86,6 +103,18 @@ class Professor(Base):
     photo_url: Mapped[str | None] = mapped_column(String(300), nullable=True)
     profile_url: Mapped[str | None] = mapped_column(String(300), nullable=True)
 
+    # set on insert (also by bulk ingest) and on ORM updates; /export?updated_since=
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=True
+    )
+
+    __table_args__ = (
+        # /schools/{id}/professors: WHERE school_id = ? ORDER BY last_name, id
+        Index("ix_professors_school_last_name", "school_id", "last_name", "id"),
+        Index("ix_professors_department_id", "department_id"),
+        Index("ix_professors_updated_at", "updated_at"),
+    )
+
     # relationships
     school = relationship(
         "School",
@@ -122,12 +151,48 @@ class Rating(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
+    __table_args__ = (
+        # /professors/{id}/ratings: WHERE professor_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_ratings_professor_created", "professor_id", "created_at", "id"),
+    )
+
     professor = relationship(
         "Professor",
         back_populates="ratings",
     )
 
 
+class ProfessorRatingStats(Base):
+    """
+    Running per-professor rating aggregate, updated in the same transaction
+    as every Rating insert so reads never scan the ratings table.
+    """
+    __tablename__ = "professor_rating_stats"
+
+    professor_id: Mapped[int] = mapped_column(
+        ForeignKey("professors.id"), primary_key=True
+    )
+    ratings_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stars_sum: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # star histogram: how many 1-star ... 5-star ratings
+    stars_1: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stars_2: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stars_3: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stars_4: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    stars_5: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    @property
+    def avg_stars(self) -> float | None:
+        if not self.ratings_count:
+            return None
+        return round(self.stars_sum / self.ratings_count, 2)
+
+    @property
+    def histogram(self) -> list[int]:
+        return [self.stars_1, self.stars_2, self.stars_3, self.stars_4, self.stars_5]
+
+
 class Course(Base):
     __tablename__ = "courses"
 
@@ -148,3 +213,38 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(200), unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     role: Mapped[str] = mapped_column(String(20), default="user")
+
+
+class ImportJob(Base):
+    """
+    A CSV import run in the background. rows_done is committed in the same
+    transaction as each batch of rows, so a restarted job resumes exactly
+    where the last committed batch ended.
+    """
+    __tablename__ = "import_jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), default="professors", nullable=False)
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # overrides the CSV school_id column when set (admin uploads)
+    school_id: Mapped[int | None] = mapped_column(ForeignKey("schools.id"), nullable=True)
+
+    # queued / running / done / failed
+    status: Mapped[str] = mapped_column(String(20), default="queued", nullable=False)
+    rows_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    delete_when_done: Mapped[bool] = mapped_column(default=False, nullable=False)
+
+    # the worker running the job ("host:pid") and when it last checkpointed;
+    # a running job whose heartbeat is older than IMPORT_JOB_LEASE_SECONDS is up for grabs
+    owner: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    heartbeat: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
@@ -23,13 +23,6 @@ class RatingIn(BaseModel):
     comment: Optional[str] = None
     course_id: Optional[int] = None
 
-class RatingOut(BaseModel):
-    id: int
-    stars: int
-    comment: Optional[str] = None
-    user_id: int
-    class Config:
-        from_attributes = True
 class RatingBase(BaseModel):
     stars: conint(ge=1, le=5)
     comment: str | None = None
@@ -39,13 +32,23 @@ class RatingCreate(RatingBase):
     pass
 
 
+class RatingQueued(RatingBase):
+    """A rating accepted in write-behind mode; it is committed shortly after."""
+    professor_id: int
+    created_at: datetime
+    status: str = "queued"
+
+
 class RatingOut(RatingBase):
     id: int
     professor_id: int
+    user_id: Optional[int] = None
     created_at: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
 class ProfessorOut(BaseModel):
     id: int
     first_name: str
@@ -57,3 +60,95 @@ class ProfessorOut(BaseModel):
     photo_url: Optional[str] = None
     class Config:
         from_attributes = True
+
+
+class ProfessorDetail(ProfessorOut):
+    """/professors/{id}: the profile plus its live rating aggregate."""
+    name: Optional[str] = None
+    rating: Optional[float] = None
+    avg_stars: Optional[float] = None
+    ratings_count: int = 0
+    histogram: List[int] = [0, 0, 0, 0, 0]
+
+
+class ProfessorSummary(BaseModel):
+    """One row of /schools/{id}/professors; keys outside ?fields= are left unset."""
+    id: int
+    name: Optional[str] = None
+    department: Optional[str] = None
+    level: Optional[str] = None
+    email: Optional[str] = None
+    rating: Optional[float] = None
+    bio: Optional[str] = None
+    school_id: Optional[int] = None
+
+
+class ProfessorPage(BaseModel):
+    total: Optional[int] = None
+    page: Optional[int] = None
+    page_size: int
+    next_cursor: Optional[str] = None
+    items: List[ProfessorSummary]
+
+
+class ProfessorIdsIn(BaseModel):
+    ids: List[int]
+
+
+class ProfessorBatch(BaseModel):
+    items: List[ProfessorDetail]
+    missing: List[int]
+
+
+class LeaderboardEntry(BaseModel):
+    id: int
+    name: str
+    department: Optional[str] = None
+    score: float            # Bayesian average used for the ranking
+    avg_rating: float
+    ratings_count: int
+
+
+class Leaderboard(BaseModel):
+    school_id: int
+    department: Optional[str] = None
+    prior_mean: float
+    prior_weight: int
+    items: List[LeaderboardEntry]
+
+
+class SchoolOut(BaseModel):
+    id: int
+    name: str
+    city: Optional[str] = None
+    state: Optional[str] = None
+    state_code: Optional[str] = None
+    public_private: Optional[str] = None
+    tuition_text: Optional[str] = None
+    tuition_in_state: Optional[int] = None
+    tuition_out_of_state: Optional[int] = None
+    class Config:
+        from_attributes = True
+
+
+class SchoolSummary(BaseModel):
+    """One row of /schools/search; the frontend reads tuition_text as "tuition"."""
+    id: int
+    name: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    state_code: Optional[str] = None
+    public_private: Optional[str] = None
+    tuition: Optional[str] = None
+    tuition_in_state: Optional[int] = None
+    tuition_out_of_state: Optional[int] = None
+    class Config:
+        from_attributes = True
+
+
+class SchoolPage(BaseModel):
+    total: Optional[int] = None
+    page: Optional[int] = None
+    page_size: int
+    next_cursor: Optional[str] = None
+    items: List[SchoolSummary]
@@ -0,0 +1,192 @@
+"""
+Response cache for the read-heavy catalog endpoints.
+
+Entries are keyed by path + normalized query string + the current version
+of every namespace the response depends on ("school:4", "professor:12",
+"schools", ...). Invalidating a namespace just bumps its version, so stale
+entries are never read again and age out through TTL/LRU eviction. The
+in-process store is the default; set CACHE_BACKEND=redis and CACHE_URL to
+share entries (and invalidations) between workers and the seed scripts.
+
+A request whose reads are pinned to the primary (it wrote, or carries the
+sticky cookie; see app.db) bypasses the cache both ways: a replica may
+already have filled the new version's entry with pre-write data, and that
+must not be served to the client that just wrote.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.db import reads_use_primary
+
+ALL = "all"
+
+
+class MemoryCache:
+    """Thread-safe LRU with per-entry TTL and a hard cap on entry count."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def versions(self, namespaces: list[str]) -> list[int]:
+        with self._lock:
+            return [self._versions.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """Same interface backed by any Redis-compatible server (Redis, Valkey, ...)."""
+
+    def __init__(self, url: str, ttl: int, prefix: str = "rmp:cache:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    def versions(self, namespaces: list[str]) -> list[int]:
+        values = self.client.mget([f"{self.prefix}v:{ns}" for ns in namespaces])
+        return [int(v) if v else 0 for v in values]
+
+    def bump(self, namespace: str) -> None:
+        self.client.incr(f"{self.prefix}v:{namespace}")
+
+    def clear(self) -> None:
+        self.bump(ALL)
+
+
+def _make_backend():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(settings.CACHE_URL, ttl=settings.CACHE_TTL_SECONDS)
+    return MemoryCache(settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
+
+
+backend = _make_backend()
+
+
+# -----------------------------
+# INVALIDATION
+# -----------------------------
+def invalidate(*namespaces: str) -> None:
+    for ns in namespaces:
+        backend.bump(ns)
+
+
+def invalidate_all() -> None:
+    backend.bump(ALL)
+
+
+def invalidate_professor(professor_id: int, school_id: int | None = None) -> None:
+    invalidate(f"professor:{professor_id}", *([f"school:{school_id}"] if school_id else []))
+
+
+# -----------------------------
+# RESPONSES
+# -----------------------------
+def _cache_key(request: Request, namespaces: list[str]) -> str:
+    query = "&".join(
+        f"{k}={v}" for k, v in sorted(request.query_params.multi_items()) if v != ""
+    )
+    scope = [ALL, *namespaces]
+    versions = ",".join(map(str, backend.versions(scope)))
+    return f"{request.url.path}?{query}#{versions}"
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        # fields the builder never set (sparse ?fields= projections) are left out
+        return obj.model_dump(exclude_unset=True)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _render(data: Any) -> bytes:
+    """Pydantic models (at any depth), dicts, lists and datetimes straight to JSON bytes."""
+    return orjson.dumps(data, default=_default)
+
+
+def _lookup(request: Request, namespaces: list[str]) -> tuple[str | None, bytes | None]:
+    """(key, cached body); key is None when this request must not use the cache."""
+    if not settings.CACHE_ENABLED or reads_use_primary():
+        return None, None
+    key = _cache_key(request, namespaces)
+    return key, backend.get(key)
+
+
+def _respond(request: Request, body: bytes) -> Response:
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.CACHE_HTTP_MAX_AGE}",
+    }
+    inm = request.headers.get("if-none-match")
+    if inm and etag in [t.strip() for t in inm.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_json(request: Request, namespaces: Iterable[str], build: Callable[[], Any]) -> Response:
+    """
+    Serve build()'s JSON from the cache when possible, with an ETag so a
+    browser revalidating with If-None-Match gets an empty 304.
+    """
+    key, body = _lookup(request, list(namespaces))
+    if body is None:
+        body = _render(build())
+        if key is not None:
+            backend.set(key, body)
+    return _respond(request, body)
+
+
+async def cached_json_async(
+    request: Request, namespaces: Iterable[str], build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """cached_json for async handlers: build is awaited on a miss."""
+    key, body = _lookup(request, list(namespaces))
+    if body is None:
+        body = _render(await build())
+        if key is not None:
+            backend.set(key, body)
+    return _respond(request, body)
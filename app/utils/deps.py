@@ -1,20 +1,115 @@
+import hashlib
+import time
+
 from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import jwt, JWTError
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.core.config import settings
 from app.models.models import User
+from app.utils.lru import ExpiringLRU
 
-def get_current_user(db: Session = Depends(get_db), authorization: str | None = None) -> User:
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
-    token = authorization.split()[1]
+# auto_error=False so a missing header is a 401 like every other auth failure
+bearer = HTTPBearer(auto_error=False)
+
+# sha256(token) -> verified claims, dropped at the token's own exp
+_claims_cache = ExpiringLRU(settings.AUTH_TOKEN_CACHE_SIZE)
+# user id -> the columns a request needs (never the password hash)
+_user_cache = ExpiringLRU(settings.AUTH_USER_CACHE_SIZE)
+_USER_COLUMNS = (User.id, User.name, User.email, User.role)
+
+
+def decode_token(token: str) -> dict:
+    """jwt.decode, skipped for a token already verified and not yet expired."""
+    key = hashlib.sha256(token.encode()).digest()
+    claims = _claims_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        if isinstance(claims.get("exp"), (int, float)):
+            _claims_cache.set(key, claims, claims["exp"])
+    return claims
+
+
+def _user_statement(user_id: int):
+    return select(*_USER_COLUMNS).where(User.id == user_id)
+
+
+def _remember_user(user_id: int, row) -> dict | None:
+    if row is None:
+        return None
+    values = row._asdict()
+    _user_cache.set(user_id, values, time.time() + settings.AUTH_USER_CACHE_TTL_SECONDS)
+    return values
+
+
+def load_user(db: Session, user_id: int) -> User | None:
+    """
+    The user as a detached, read-only User. Cached for
+    AUTH_USER_CACHE_TTL_SECONDS and dropped as soon as this process
+    updates or deletes the row.
+    """
+    values = _user_cache.get(user_id)
+    if values is None:
+        values = _remember_user(user_id, db.execute(_user_statement(user_id)).first())
+    return User(**values) if values else None
+
+
+async def load_user_async(db: AsyncSession, user_id: int) -> User | None:
+    values = _user_cache.get(user_id)
+    if values is None:
+        values = _remember_user(user_id, (await db.execute(_user_statement(user_id))).first())
+    return User(**values) if values else None
+
+
+def invalidate_user(user_id: int) -> None:
+    _user_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+def token_user_id(token: str) -> int:
+    """The user id a bearer token was issued for; 401 if it is invalid or expired."""
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-        user_id = int(payload.get("sub"))
+        return int(decode_token(token).get("sub"))
     except (JWTError, ValueError, TypeError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(User).get(user_id)
+
+
+def _bearer_token(credentials: HTTPAuthorizationCredentials | None) -> str:
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
+    return credentials.credentials
+
+
+def _found(user: User | None) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> User:
+    return _found(load_user(db, token_user_id(_bearer_token(credentials))))
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> User:
+    """get_current_user for the async routers (DB_ASYNC=true)."""
+    return _found(await load_user_async(db, token_user_id(_bearer_token(credentials))))
+
+
+def require_admin(user: User = Depends(get_current_user)) -> User:
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    return user
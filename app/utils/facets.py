@@ -0,0 +1,154 @@
+"""
+In-memory bitmap index behind /schools/facets.
+
+Every school gets a slot; each facet value (state code, public/private,
+tuition bucket) keeps a Python int whose set bits are the slots of the
+schools that have it. A facet count is then the popcount of an AND of
+bitmaps, so one call returns every count for the current filters without
+touching the database.
+
+ingest_schools updates the index in place after it commits. Writes from
+other processes (seed scripts, other workers) are picked up through the
+response-cache namespace versions: when they move, the next read rebuilds
+from a single column-projected SELECT.
+"""
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import School
+from app.utils.cache import ALL, backend
+
+# (key, low inclusive, high exclusive); None is open-ended
+TUITION_BUCKETS = [
+    ("lt_10k", None, 10_000),
+    ("10k_20k", 10_000, 20_000),
+    ("20k_30k", 20_000, 30_000),
+    ("30k_40k", 30_000, 40_000),
+    ("40k_50k", 40_000, 50_000),
+    ("50k_60k", 50_000, 60_000),
+    ("60k_plus", 60_000, None),
+]
+TUITION_BASES = ("in_state", "out_of_state")
+FACETS = ("state", "public_private", *(f"tuition_{b}" for b in TUITION_BASES))
+
+_VERSION_NAMESPACES = [ALL, "schools"]
+
+
+def tuition_bucket(amount: int | None) -> str | None:
+    if amount is None:
+        return None
+    for key, low, high in TUITION_BUCKETS:
+        if (low is None or amount >= low) and (high is None or amount < high):
+            return key
+    return None
+
+
+def _school_facets(values: dict) -> dict[str, str | None]:
+    kind = values.get("public_private")
+    return {
+        "state": values.get("state_code"),
+        "public_private": kind.strip().lower() if kind else None,
+        "tuition_in_state": tuition_bucket(values.get("tuition_in_state")),
+        "tuition_out_of_state": tuition_bucket(values.get("tuition_out_of_state")),
+    }
+
+
+class FacetIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: list[int] | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._slots: dict[int, int] = {}        # school id -> bit position
+        self._values: dict[int, dict] = {}      # school id -> facet values
+        self._bitmaps: dict[str, dict[str, int]] = {f: {} for f in FACETS}
+        self._all = 0
+
+    def _set(self, school_id: int, facets: dict[str, str | None]) -> None:
+        slot = self._slots.get(school_id)
+        if slot is None:
+            slot = self._slots[school_id] = len(self._slots)
+            self._all |= 1 << slot
+        bit = 1 << slot
+        old = self._values.get(school_id, {})
+        for facet, value in facets.items():
+            if old.get(facet) == value:
+                continue
+            if old.get(facet) is not None:
+                self._bitmaps[facet][old[facet]] &= ~bit
+            if value is not None:
+                bitmaps = self._bitmaps[facet]
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+        self._values[school_id] = facets
+
+    # -----------------------------
+    # MAINTENANCE
+    # -----------------------------
+    def rebuild(self, db: Session) -> None:
+        version = backend.versions(_VERSION_NAMESPACES)
+        rows = db.execute(
+            select(School.id, School.state_code, School.public_private,
+                   School.tuition_in_state, School.tuition_out_of_state)
+        ).mappings()
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._set(row["id"], _school_facets(row))
+            self._version = version
+
+    def upsert(self, rows: list[dict]) -> None:
+        """Apply ingested school values (school_values dicts) in place."""
+        with self._lock:
+            if self._version is None:
+                return  # never built; the first read does a full build
+            for values in rows:
+                self._set(values["id"], _school_facets(values))
+
+    def mark_current(self) -> None:
+        """Adopt the current cache versions after an in-process upsert."""
+        with self._lock:
+            if self._version is not None:
+                self._version = backend.versions(_VERSION_NAMESPACES)
+
+    def refresh(self, db: Session) -> None:
+        """Rebuild if never built or if another process changed the schools."""
+        if self._version != backend.versions(_VERSION_NAMESPACES):
+            self.rebuild(db)
+
+    # -----------------------------
+    # QUERIES
+    # -----------------------------
+    def counts(self, filters: dict[str, str | None]) -> dict:
+        """
+        Count every value of every facet under `filters`.
+        Each facet ignores its own filter, so the UI can show the
+        alternatives to the current selection.
+        """
+        with self._lock:
+            masks = {
+                facet: self._bitmaps[facet].get(value, 0) if value else self._all
+                for facet, value in filters.items()
+            }
+
+            def matching(skip: str | None = None) -> int:
+                bits = self._all
+                for facet, mask in masks.items():
+                    if facet != skip:
+                        bits &= mask
+                return bits
+
+            result = {"total": matching().bit_count()}
+            for facet in FACETS:
+                base = matching(facet)
+                result[facet] = {
+                    value: n
+                    for value, bitmap in sorted(self._bitmaps[facet].items())
+                    if (n := (bitmap & base).bit_count())
+                }
+            return result
+
+
+school_facets = FacetIndex()
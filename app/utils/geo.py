@@ -0,0 +1,60 @@
+import re
+
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "DC": "District of Columbia", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii",
+    "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine",
+    "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska",
+    "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico",
+    "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "PR": "Puerto Rico",
+    "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee",
+    "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia",
+    "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming",
+}
+_BY_NAME = {name.lower(): code for code, name in US_STATES.items()}
+
+_AMOUNT_RE = re.compile(r"\$\s*([\d,]+(?:\.\d+)?)\s*(\([^)]*\))?")
+
+
+def to_state_code(value: str | None) -> str | None:
+    """'GA', 'ga', 'Georgia' -> 'GA'; anything else -> None."""
+    if not value:
+        return None
+    v = value.strip()
+    if v.upper() in US_STATES:
+        return v.upper()
+    return _BY_NAME.get(v.lower())
+
+
+def parse_tuition(text: str | None) -> tuple[int | None, int | None]:
+    """
+    Split tuition text into (in_state, out_of_state) whole dollars.
+      '$9,286 (in-state), $24,517 (out-of-state)' -> (9286, 24517)
+      '$57,986'                                   -> (57986, 57986)
+    Dashes in the labels may be '-' or '–'.
+    """
+    if not text:
+        return None, None
+    in_state = out_state = None
+    unlabeled = []
+    for amount, label in _AMOUNT_RE.findall(text):
+        dollars = int(float(amount.replace(",", "")))
+        label = label.lower().replace("–", "-").replace(" ", "")
+        if "out" in label:
+            out_state = dollars
+        elif "in" in label:
+            in_state = dollars
+        else:
+            unlabeled.append(dollars)
+    if unlabeled:
+        in_state = in_state if in_state is not None else unlabeled[0]
+        out_state = out_state if out_state is not None else unlabeled[-1]
+    if in_state is None:
+        in_state = out_state
+    if out_state is None:
+        out_state = in_state
+    return in_state, out_state
@@ -0,0 +1,193 @@
+"""
+In-memory top-rated rankings behind /schools/{id}/top and
+/schools/{id}/departments/{dept}/top.
+
+Professors are ranked by a Bayesian average,
+
+    score = (C * m + stars_sum) / (C + ratings_count)
+
+with prior weight C = RANKING_PRIOR_WEIGHT and prior mean m =
+RANKING_PRIOR_MEAN, or, when that is 0, the mean over all ratings at
+first use. A professor with two 5-star ratings is pulled towards m and
+does not outrank one with a hundred ratings averaging 4.8.
+
+Each school has a Board built on first read from one query over its
+professors and their rating aggregates. A Board keeps a list sorted by
+(-score, id) for the whole school and one for each department, so a
+top-k read is a slice. A new rating moves one entry in two lists (bisect
+plus list insert); nothing is rebuilt. Like the facet index, a board
+written to by another process is noticed through the response-cache
+versions of its school and rebuilt. Writers take a snapshot() before
+the write, so a board rebuilt while the write was in flight (and thus
+maybe already counting the rating) is dropped rather than updated.
+"""
+import bisect
+import math
+import threading
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Department, Professor, ProfessorRatingStats, School
+from app.utils.cache import ALL, backend
+from app.utils.lru import ExpiringLRU
+
+
+def _versions(school_id: int) -> list[int]:
+    return backend.versions([ALL, f"school:{school_id}"])
+
+
+class Board:
+    def __init__(self, school_id: int, prior_mean: float, version: list[int]):
+        self.school_id = school_id
+        self.prior_mean = prior_mean
+        self.version = version
+        self.entries: dict[int, dict] = {}         # professor id -> names, department, count, sum
+        self.ranked: list[tuple[float, int]] = []  # (-score, id), rated professors only
+        self.by_department: dict[int | None, list[tuple[float, int]]] = {}
+        self.department_names: dict[int, str] = {}
+        self.department_ids: dict[str, int] = {}   # lower-cased name -> id
+
+    def score(self, count: int, total: int) -> float:
+        weight = settings.RANKING_PRIOR_WEIGHT
+        return (weight * self.prior_mean + total) / (weight + count)
+
+    def _key(self, pid: int) -> tuple[float, int] | None:
+        e = self.entries[pid]
+        if e["count"] < max(settings.RANKING_MIN_RATINGS, 1):
+            return None
+        return (-self.score(e["count"], e["total"]), pid)
+
+    def _place(self, pid: int, old: tuple[float, int] | None) -> None:
+        new = self._key(pid)
+        lists = (self.ranked, self.by_department.setdefault(self.entries[pid]["department_id"], []))
+        for ranked in lists:
+            if old is not None:
+                del ranked[bisect.bisect_left(ranked, old)]
+            if new is not None:
+                bisect.insort(ranked, new)
+
+    def add(self, pid: int, first_name: str, last_name: str, department_id: int | None,
+            count: int, total: int) -> None:
+        self.entries[pid] = {"first_name": first_name, "last_name": last_name,
+                             "department_id": department_id, "count": count, "total": total}
+        self._place(pid, None)
+
+    def record(self, pid: int, stars: int) -> bool:
+        """Fold one new rating into its professor's entry; False if the professor isn't on the board."""
+        if pid not in self.entries:
+            return False
+        old = self._key(pid)
+        self.entries[pid]["count"] += 1
+        self.entries[pid]["total"] += stars
+        self._place(pid, old)
+        return True
+
+    def top(self, k: int, department_id: int | None = None, by_department: bool = False) -> list[dict]:
+        ranked = self.by_department.get(department_id, []) if by_department else self.ranked
+        items = []
+        for neg_score, pid in ranked[:k]:
+            e = self.entries[pid]
+            items.append({
+                "id": pid,
+                "name": f"{e['first_name']} {e['last_name']}",
+                "department": self.department_names.get(e["department_id"]),
+                "score": round(-neg_score, 4),
+                "avg_rating": round(e["total"] / e["count"], 2),
+                "ratings_count": e["count"],
+            })
+        return items
+
+
+class Leaderboards:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards = ExpiringLRU(settings.RANKING_MAX_SCHOOLS)
+        self._prior_mean: float | None = None
+
+    def _prior(self, db: Session) -> float:
+        if settings.RANKING_PRIOR_MEAN > 0:
+            return settings.RANKING_PRIOR_MEAN
+        if self._prior_mean is None:
+            count, total = db.execute(
+                select(func.sum(ProfessorRatingStats.ratings_count), func.sum(ProfessorRatingStats.stars_sum))
+            ).one()
+            self._prior_mean = total / count if count else 3.0
+        return self._prior_mean
+
+    def build(self, db: Session, school_id: int) -> Board | None:
+        """One query over the school's professors; None if the school doesn't exist."""
+        version = _versions(school_id)
+        if db.scalar(select(School.id).where(School.id == school_id)) is None:
+            return None
+        board = Board(school_id, self._prior(db), version)
+        for dept_id, name in db.execute(
+            select(Department.id, Department.name).where(Department.school_id == school_id)
+        ):
+            board.department_names[dept_id] = name
+            board.department_ids[name.lower()] = dept_id
+        rows = db.execute(
+            select(Professor.id, Professor.first_name, Professor.last_name, Professor.department_id,
+                   ProfessorRatingStats.ratings_count, ProfessorRatingStats.stars_sum)
+            .outerjoin(ProfessorRatingStats, ProfessorRatingStats.professor_id == Professor.id)
+            .where(Professor.school_id == school_id)
+        )
+        for pid, first, last, dept_id, count, total in rows:
+            board.add(pid, first, last, dept_id, count or 0, total or 0)
+        with self._lock:
+            self._boards.set(school_id, board, math.inf)
+        return board
+
+    def board(self, db: Session, school_id: int) -> Board | None:
+        """The school's board, (re)built if missing or changed by another process."""
+        board = self._boards.get(school_id)
+        if board is None or board.version != _versions(school_id):
+            board = self.build(db, school_id)
+        return board
+
+    def top(self, board: Board, k: int, department_id: int | None = None,
+            by_department: bool = False) -> list[dict]:
+        with self._lock:
+            return board.top(k, department_id, by_department)
+
+    def snapshot(self, school_id: int | None) -> tuple[Board | None, list[int]] | None:
+        """
+        The school's board and cache versions, taken before a rating is
+        written. record() only folds the rating into that same board at
+        those same versions; a board built or changed since may already
+        contain the rating, so it is dropped and rebuilt instead.
+        """
+        if school_id is None:
+            return None
+        board = self._boards.get(school_id)
+        return board, _versions(school_id)
+
+    def record(self, school_id: int | None, ratings: list[tuple[int, int]],
+               before: tuple[Board | None, list[int]] | None) -> None:
+        """
+        Apply committed (professor_id, stars) ratings in place. Call after
+        invalidate_professor, so the board adopts the versions they bumped.
+        """
+        if school_id is None or before is None:
+            return
+        seen, versions = before
+        with self._lock:
+            board = self._boards.get(school_id)
+            if board is None:
+                return  # never read; built on first read
+            if board is not seen or board.version != versions:
+                self._boards.pop(school_id)
+                return
+            if all(board.record(pid, stars) for pid, stars in ratings):
+                board.version = _versions(school_id)
+            else:
+                self._boards.pop(school_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._boards.clear()
+            self._prior_mean = None
+
+
+leaderboards = Leaderboards()
@@ -0,0 +1,221 @@
+"""
+Request and SQL metrics, exposed at /metrics in the Prometheus text format.
+
+MetricsMiddleware wraps every HTTP request. It opens a per-request
+counter dict in a ContextVar, and the engine events installed by
+app.db.instrument_engine add to it for each SQL statement and pool
+checkout, whichever thread or greenlet runs the statement. When the
+response finishes, the totals are recorded under the matched route
+template (/schools/{school_id}, not /schools/42), which keeps label
+cardinality bounded.
+
+Statements slower than SLOW_QUERY_MS are logged on the "app.slow_query"
+logger with their parameters and, for SELECTs, the EXPLAIN plan.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from app.core.config import settings
+
+slow_query_log = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label tuple (callers hold the registry lock)."""
+
+    def __init__(self, name: str, help: str, buckets: tuple):
+        self.name, self.help, self.buckets = name, help, buckets
+        self._series: dict[tuple, list] = {}   # labels -> [bucket counts..., sum, count]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self, label_names: tuple) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _labels(label_names, labels)
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._series: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple, value: float = 1) -> None:
+        self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self, label_names: tuple) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            base = _labels(label_names, labels)
+            lines.append(f"{self.name}{{{base}}} {_number(value)}" if base else f"{self.name} {_number(value)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
+
+
+# -----------------------------
+# REGISTRY
+# -----------------------------
+ROUTE_LABELS = ("method", "route")
+
+_lock = threading.Lock()
+requests_total = Counter("rmp_http_requests_total", "HTTP requests by route and status.")
+request_seconds = Histogram("rmp_http_request_duration_seconds", "Request latency.", LATENCY_BUCKETS)
+request_queries = Histogram("rmp_http_request_db_queries", "SQL statements per request.", QUERY_BUCKETS)
+request_db_seconds = Histogram("rmp_http_request_db_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS)
+request_checkouts = Counter("rmp_http_request_pool_checkouts_total", "Connection pool checkouts by route.")
+response_bytes = Histogram("rmp_http_response_size_bytes", "Response body size.", SIZE_BUCKETS)
+
+# statements outside any request (startup, import jobs) are only counted here
+db_queries = Counter("rmp_db_queries_total", "SQL statements executed.")
+db_seconds = Counter("rmp_db_query_seconds_total", "Time spent executing SQL.")
+db_slow_queries = Counter("rmp_db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+
+_request: ContextVar[dict | None] = ContextVar("request_metrics", default=None)
+
+
+def record_query(seconds: float) -> None:
+    stats = _request.get()
+    if stats is not None:
+        stats["queries"] += 1
+        stats["db_seconds"] += seconds
+    with _lock:
+        db_queries.inc((), 1)
+        db_seconds.inc((), seconds)
+        if _is_slow(seconds):
+            db_slow_queries.inc((), 1)
+
+
+def record_checkout() -> None:
+    stats = _request.get()
+    if stats is not None:
+        stats["checkouts"] += 1
+
+
+def _is_slow(seconds: float) -> bool:
+    return settings.SLOW_QUERY_MS > 0 and seconds * 1000 >= settings.SLOW_QUERY_MS
+
+
+def log_slow_query(cursor_conn, statement: str, parameters, seconds: float, explain) -> None:
+    """Log a statement past SLOW_QUERY_MS; `explain(cursor_conn, statement, parameters)` gives the plan."""
+    if not _is_slow(seconds):
+        return
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        try:
+            plan = explain(cursor_conn, statement, parameters)
+        except Exception as e:   # the plan is best effort; never fail the request over it
+            plan = [f"EXPLAIN failed: {e}"]
+    stats = _request.get()
+    route = stats["scope"].get("route") if stats else None
+    slow_query_log.warning(
+        "slow query %.1f ms%s\n%s\nparams: %r%s",
+        seconds * 1000,
+        f" ({route.path})" if route is not None else "",
+        statement,
+        parameters,
+        "".join(f"\n    {line}" for line in plan) if plan else "",
+    )
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are measured as they are sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = {"queries": 0, "db_seconds": 0.0, "checkouts": 0, "scope": scope}
+        token = _request.set(stats)
+        status, size = 500, 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request.reset(token)
+            route = scope.get("route")
+            # unmatched paths share one label so scanners can't blow up cardinality
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            with _lock:
+                requests_total.inc((*labels, str(status)))
+                request_seconds.observe(labels, elapsed)
+                request_queries.observe(labels, stats["queries"])
+                request_db_seconds.observe(labels, stats["db_seconds"])
+                request_checkouts.inc(labels, stats["checkouts"])
+                response_bytes.observe(labels, size)
+
+
+def render(pools: dict[str, dict] | None = None) -> str:
+    """The whole registry in the text exposition format; `pools` are pool_stats() by name."""
+    with _lock:
+        lines = requests_total.render((*ROUTE_LABELS, "status"))
+        lines += request_seconds.render(ROUTE_LABELS)
+        lines += request_queries.render(ROUTE_LABELS)
+        lines += request_db_seconds.render(ROUTE_LABELS)
+        lines += request_checkouts.render(ROUTE_LABELS)
+        lines += response_bytes.render(ROUTE_LABELS)
+        lines += db_queries.render(())
+        lines += db_seconds.render(())
+        lines += db_slow_queries.render(())
+
+    for key, name, kind, help in (
+        ("checkouts", "rmp_db_pool_checkouts_total", "counter", "Connection pool checkouts."),
+        ("connects", "rmp_db_pool_connects_total", "counter", "New DBAPI connections opened."),
+        ("wait_seconds_total", "rmp_db_pool_wait_seconds_total", "counter",
+         "Time spent waiting for a pooled connection."),
+        ("in_use", "rmp_db_pool_in_use", "gauge", "Connections currently checked out."),
+        ("peak_in_use", "rmp_db_pool_peak_in_use", "gauge", "Most connections checked out at once."),
+    ):
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+        for pool, stats in (pools or {}).items():
+            lines.append(f'{name}{{pool="{_escape(pool)}"}} {_number(stats[key])}')
+    return "\n".join(lines) + "\n"
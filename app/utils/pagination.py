@@ -0,0 +1,49 @@
+import base64
+import json
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row (plus its id) into an opaque token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# largest value of a 64-bit signed integer column (SQLite INTEGER, Postgres BIGINT)
+MAX_INT64 = 2**63 - 1
+
+
+def _valid(value: Any, kind: type) -> bool:
+    if kind is int:
+        # bool is an int subclass; out-of-range ints overflow the driver
+        return type(value) is int and 0 <= value <= MAX_INT64
+    return isinstance(value, kind)
+
+
+def decode_cursor(token: str, *kinds: type) -> list:
+    """
+    Unpack a token from encode_cursor whose values have the given types,
+    e.g. decode_cursor(token, str, int); a malformed token is a 400.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (not isinstance(values, list) or len(values) != len(kinds)
+            or not all(_valid(v, kind) for v, kind in zip(values, kinds))):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def split_page(rows: Sequence, page_size: int, key: Callable[[Any], tuple]):
+    """
+    Given page_size + 1 rows, return (page_rows, next_cursor).
+    next_cursor is None when there is nothing after this page.
+    """
+    if len(rows) <= page_size:
+        return list(rows), None
+    page = list(rows[:page_size])
+    return page, encode_cursor(*key(page[-1]))
@@ -0,0 +1,278 @@
+"""
+Opt-in sampling profiler for single requests.
+
+A request is profiled when an admin sends `X-Profile: 1` (with
+PROFILE_ALLOW_HEADER=true), or at random with probability
+PROFILE_SAMPLE_RATE. While at least one profile is
+open, a daemon thread reads sys._current_frames() every
+PROFILE_INTERVAL_MS and attributes each stack to its profile:
+
+- the event-loop thread, but only while the request's own task is the
+  one running (asyncio.current_task(loop)), so other requests'
+  coroutines don't leak in;
+- threadpool threads while they run this request's sync handler
+  (instrument_routes wraps sync endpoints to register their thread).
+
+When the response is done the samples are written to PROFILE_DIR as
+speedscope JSON (https://www.speedscope.app) or collapsed stacks for
+flamegraph.pl, and listed at /admin/profiles. With neither the header
+nor sampling enabled nothing is installed, and unprofiled requests pay
+one header lookup.
+"""
+import asyncio
+import datetime
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile"
+SUFFIXES = {"speedscope": ".speedscope.json", "collapsed": ".collapsed.txt"}
+
+_current: ContextVar["Profile | None"] = ContextVar("profile", default=None)
+
+
+class Profile:
+    def __init__(self, method: str, path: str):
+        stamp = datetime.datetime.now(datetime.timezone.utc)
+        slug = "".join(c if c.isalnum() else "_" for c in path.strip("/"))[:60] or "root"
+        self.name = f"{stamp:%Y%m%dT%H%M%S}-{method}-{slug}-{uuid.uuid4().hex[:6]}"
+        self.title = f"{method} {path}"
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        self.threads: set[int] = set()
+        self.samples: Counter = Counter()   # stack (root first) -> samples
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def sample(self, frames: dict) -> None:
+        for tid in (self.loop_thread, *self.threads):
+            if tid == self.loop_thread and asyncio.current_task(self.loop) is not self.task:
+                continue
+            frame = frames.get(tid)
+            if frame is not None:
+                self.samples[_stack(frame)] += 1
+
+    # -----------------------------
+    # OUTPUT
+    # -----------------------------
+    def filename(self) -> str:
+        return self.name + SUFFIXES[settings.PROFILE_FORMAT]
+
+    def save(self) -> str:
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(settings.PROFILE_DIR, self.filename())
+        with open(path, "w", encoding="utf-8") as f:
+            if settings.PROFILE_FORMAT == "collapsed":
+                for stack, n in self.samples.most_common():
+                    f.write(";".join(_label(fr) for fr in stack) + f" {n}\n")
+            else:
+                json.dump(self.speedscope(), f)
+        return path
+
+    def speedscope(self) -> dict:
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, n in self.samples.items():
+            ids = []
+            for fr in stack:
+                if fr not in index:
+                    index[fr] = len(frames)
+                    frames.append({"name": fr[0], "file": fr[1], "line": fr[2]})
+                ids.append(index[fr])
+            samples.append(ids)
+            weights.append(n * settings.PROFILE_INTERVAL_MS)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "rmp-api",
+            "name": self.title,
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.title} ({self.seconds * 1000:.1f} ms wall)",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def _stack(frame) -> tuple:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _label(fr: tuple) -> str:
+    return f"{fr[0]} ({os.path.basename(fr[1])}:{fr[2]})"
+
+
+# -----------------------------
+# SAMPLER
+# -----------------------------
+_lock = threading.Lock()
+_active: set[Profile] = set()
+_sampler: threading.Thread | None = None
+
+
+def _run_sampler() -> None:
+    global _sampler
+    interval = settings.PROFILE_INTERVAL_MS / 1000
+    me = threading.get_ident()
+    while True:
+        with _lock:
+            if not _active:
+                _sampler = None
+                return
+            profiles = list(_active)
+        frames = sys._current_frames()
+        frames.pop(me, None)
+        for profile in profiles:
+            profile.sample(frames)
+        del frames
+        time.sleep(interval)
+
+
+def _start(profile: Profile) -> None:
+    global _sampler
+    with _lock:
+        _active.add(profile)
+        if _sampler is None:
+            _sampler = threading.Thread(target=_run_sampler, name="request-profiler", daemon=True)
+            _sampler.start()
+
+
+def _stop(profile: Profile) -> None:
+    profile.seconds = time.perf_counter() - profile.started
+    with _lock:
+        _active.discard(profile)
+
+
+def _in_thread(func):
+    """Register the worker thread with the request's profile while a sync endpoint runs."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        tid = threading.get_ident()
+        profile.threads.add(tid)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.threads.discard(tid)
+    return wrapper
+
+
+def instrument_routes(routes) -> None:
+    """Wrap sync endpoints (they run on the threadpool) so their thread is sampled too."""
+    for route in routes:
+        if isinstance(route, APIRoute) and not asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = _in_thread(route.dependant.call)
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+def _is_admin(authorization: str) -> bool:
+    """The same check as the require_admin dependency guarding /admin/*."""
+    from fastapi import HTTPException
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.db import SessionLocal
+    from app.utils.deps import get_current_user, require_admin
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        with SessionLocal() as db:
+            require_admin(get_current_user(db, HTTPAuthorizationCredentials(scheme=scheme, credentials=token)))
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilingMiddleware:
+    """
+    Innermost middleware, so the request runs in the task it starts in.
+    Adds X-Profile-Id (the stored file name) to profiled responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _wanted(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if settings.PROFILE_ALLOW_HEADER and headers.get(PROFILE_HEADER) == b"1":
+            return await run_in_threadpool(_is_admin, headers.get(b"authorization", b"").decode("latin-1"))
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self._wanted(scope):
+            return await self.app(scope, receive, send)
+
+        profile = Profile(scope["method"], scope["path"])
+        token = _current.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []),
+                                      (b"x-profile-id", profile.filename().encode())]
+            await send(message)
+
+        _start(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _stop(profile)
+            _current.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                profile.title = f"{scope['method']} {route.path}"
+            await run_in_threadpool(profile.save)
+
+
+def list_profiles() -> list[dict]:
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    items = []
+    for entry in os.scandir(settings.PROFILE_DIR):
+        if entry.is_file() and entry.name.endswith(tuple(SUFFIXES.values())):
+            st = entry.stat()
+            items.append({
+                "name": entry.name,
+                "size": st.st_size,
+                "created_at": datetime.datetime.fromtimestamp(st.st_mtime, datetime.timezone.utc),
+            })
+    return sorted(items, key=lambda i: i["created_at"], reverse=True)
+
+
+def profile_path(name: str) -> str | None:
+    """Path of a stored profile, or None for anything that isn't one (no traversal)."""
+    if os.path.basename(name) != name or not name.endswith(tuple(SUFFIXES.values())):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def enabled() -> bool:
+    return settings.PROFILE_ALLOW_HEADER or settings.PROFILE_SAMPLE_RATE > 0
@@ -0,0 +1,206 @@
+"""
+Write-behind rating ingestion (RATINGS_WRITE_BEHIND=true).
+
+POST /professors/{id}/ratings validates the rating, puts it on a bounded
+in-process queue and answers 202 right away. One flusher thread takes
+up to RATINGS_FLUSH_BATCH ratings at a time and writes them in a single
+transaction: an executemany INSERT of the ratings plus one bulk
+aggregate update (app.utils.ratings.apply_ratings). That is one commit
+and one fsync per batch instead of one per rating.
+
+A rating is committed at most RATINGS_FLUSH_MAX_DELAY_MS after it was
+accepted, plus the flush itself, so readers see it shortly after the
+202. When the queue is full, submit() raises queue.Full and the route
+answers 503. stop() (on shutdown) drains the queue before returning.
+Ratings still queued when the process is killed are lost; that is the
+price of the mode, and the reason it is opt-in.
+
+A batch that still fails after FLUSH_ATTEMPTS tries is written in
+halves, down to single ratings, so only the ratings that can't be
+written are dropped. stats() counts those writes as "isolation_writes",
+apart from "batches", and the lost ratings as "dropped".
+"""
+import datetime
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.models import Rating
+from app.utils.cache import invalidate_professor
+from app.utils.leaderboards import leaderboards
+from app.utils.ratings import apply_ratings
+
+log = logging.getLogger(__name__)
+
+FLUSH_ATTEMPTS = 3
+
+
+@dataclass
+class PendingRating:
+    professor_id: int
+    school_id: int | None
+    stars: int
+    comment: str | None
+    user_id: int | None = None
+    created_at: datetime.datetime = field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    accepted: float = field(default_factory=time.monotonic)
+
+
+_STOP = object()
+
+
+class RatingBuffer:
+    def __init__(self):
+        self._queue: queue.Queue | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.accepted = self.written = self.batches = self.isolation_writes = self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._queue = queue.Queue(maxsize=settings.RATINGS_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="rating-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush everything queued so far, then stop the flusher."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)   # blocks while full; the flusher is draining it
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, pending: PendingRating) -> None:
+        """Queue a rating; raises queue.Full when the buffer is at capacity."""
+        self._queue.put_nowait(pending)
+        with self._lock:
+            self.accepted += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queued": self._queue.qsize() if self._queue else 0,
+                "accepted": self.accepted,
+                "written": self.written,
+                "batches": self.batches,
+                "isolation_writes": self.isolation_writes,
+                "dropped": self.dropped,
+            }
+
+    # -----------------------------
+    # FLUSHER
+    # -----------------------------
+    def _run(self) -> None:
+        max_delay = settings.RATINGS_FLUSH_MAX_DELAY_MS / 1000
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            # group commit: wait for more until the oldest rating hits its deadline
+            deadline = item.accepted + max_delay
+            while len(batch) < settings.RATINGS_FLUSH_BATCH:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+        # anything that raced in behind the stop marker
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                rest.append(item)
+        for i in range(0, len(rest), settings.RATINGS_FLUSH_BATCH):
+            self._flush(rest[i:i + settings.RATINGS_FLUSH_BATCH])
+
+    def _flush(self, batch: list[PendingRating]) -> None:
+        before = _snapshots(batch)
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            try:
+                write_batch(batch)
+                break
+            except Exception:
+                if attempt == FLUSH_ATTEMPTS:
+                    log.exception("writing %d buffered ratings failed %d times", len(batch), attempt)
+                    self._isolate(batch)
+                    return
+                time.sleep(0.1 * attempt)
+        self._committed(batch, before)
+
+    def _isolate(self, batch: list[PendingRating]) -> None:
+        """
+        Write a batch that keeps failing in halves, down to single ratings,
+        so only the ratings that can't be written are dropped.
+        """
+        if len(batch) == 1:
+            log.error("dropping buffered rating for professor %d", batch[0].professor_id)
+            with self._lock:
+                self.dropped += 1
+            return
+        mid = len(batch) // 2
+        for half in (batch[:mid], batch[mid:]):
+            before = _snapshots(half)
+            try:
+                write_batch(half)
+            except Exception:
+                self._isolate(half)
+            else:
+                self._committed(half, before, isolating=True)
+
+    def _committed(self, batch: list[PendingRating], before: dict, isolating: bool = False) -> None:
+        with self._lock:
+            self.written += len(batch)
+            if isolating:
+                self.isolation_writes += 1
+            else:
+                self.batches += 1
+        for professor_id, school_id in {(p.professor_id, p.school_id) for p in batch}:
+            invalidate_professor(professor_id, school_id)
+        by_school: dict[int | None, list[tuple[int, int]]] = {}
+        for p in batch:
+            by_school.setdefault(p.school_id, []).append((p.professor_id, p.stars))
+        for school_id, ratings in by_school.items():
+            leaderboards.record(school_id, ratings, before.get(school_id))
+
+
+def _snapshots(batch: list[PendingRating]) -> dict:
+    """Leaderboard snapshots of the batch's schools, taken before it is written."""
+    return {school_id: leaderboards.snapshot(school_id) for school_id in {p.school_id for p in batch}}
+
+
+def write_batch(batch: list[PendingRating]) -> None:
+    """Insert the ratings and fold them into the aggregates in one transaction."""
+    with SessionLocal() as db:
+        db.execute(insert(Rating), [
+            {"professor_id": p.professor_id, "stars": p.stars, "comment": p.comment,
+             "user_id": p.user_id, "created_at": p.created_at}
+            for p in batch
+        ])
+        apply_ratings(db, [(p.professor_id, p.stars) for p in batch])
+        db.commit()
+
+
+rating_buffer = RatingBuffer()
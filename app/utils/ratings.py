@@ -0,0 +1,117 @@
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.models import ProfessorRatingStats, Rating
+
+
+STATS_COLUMNS = ("ratings_count", "stars_sum", *(f"stars_{k}" for k in range(1, 6)))
+
+_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def _stats_upsert(dialect: str):
+    """
+    INSERT ... ON CONFLICT (professor_id) DO UPDATE adding each new row's
+    counts onto the existing ones. One statement, so two first ratings
+    for the same professor can't both try to create the row.
+    """
+    table = ProfessorRatingStats.__table__
+    stmt = _INSERTS[dialect](table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.professor_id],
+        set_={name: table.c[name] + stmt.excluded[name] for name in STATS_COLUMNS},
+    )
+
+
+def _stats_row(professor_id: int, count: int, total: int, histogram) -> dict:
+    return {"professor_id": professor_id, "ratings_count": count, "stars_sum": total,
+            **{f"stars_{k}": histogram[k - 1] for k in range(1, 6)}}
+
+
+def _first_rating(professor_id: int, stars: int) -> dict:
+    return _stats_row(professor_id, 1, stars, [int(k == stars) for k in range(1, 6)])
+
+
+def apply_rating(db: Session, professor_id: int, stars: int) -> None:
+    """
+    Fold one new rating into the professor's aggregate row.
+    Does not commit: the caller commits together with the Rating insert.
+    """
+    db.connection().execute(_stats_upsert(db.get_bind().dialect.name), _first_rating(professor_id, stars))
+
+
+def add_rating(db: Session, professor_id: int, stars: int, comment: str | None = None,
+               user_id: int | None = None) -> Rating:
+    rating = Rating(professor_id=professor_id, stars=stars, comment=comment, user_id=user_id)
+    db.add(rating)
+    apply_rating(db, professor_id, stars)
+    db.commit()
+    db.refresh(rating)
+    return rating
+
+
+async def add_rating_async(db: AsyncSession, professor_id: int, stars: int,
+                           comment: str | None = None, user_id: int | None = None) -> Rating:
+    rating = Rating(professor_id=professor_id, stars=stars, comment=comment, user_id=user_id)
+    db.add(rating)
+    conn = await db.connection()
+    await conn.execute(_stats_upsert(conn.dialect.name), _first_rating(professor_id, stars))
+    await db.commit()
+    await db.refresh(rating)
+    return rating
+
+
+def apply_ratings(db: Session, ratings: list[tuple[int, int]]) -> None:
+    """
+    Fold many (professor_id, stars) pairs into the aggregates with one
+    executemany upsert, one row per professor. Does not commit.
+    """
+    deltas: dict[int, list[int]] = {}
+    for professor_id, stars in ratings:
+        d = deltas.setdefault(professor_id, [0] * 7)   # count, sum, stars_1..stars_5
+        d[0] += 1
+        d[1] += stars
+        d[1 + stars] += 1
+    if deltas:
+        db.connection().execute(
+            _stats_upsert(db.get_bind().dialect.name),
+            [_stats_row(pid, d[0], d[1], d[2:]) for pid, d in deltas.items()],
+        )
+
+
+def get_stats(db: Session, professor_id: int) -> ProfessorRatingStats | None:
+    return db.get(ProfessorRatingStats, professor_id)
+
+
+def rebuild_stats(db: Session) -> int:
+    """
+    Recompute every aggregate row from the ratings table in one grouped query.
+    Used once to backfill ratings that were loaded before aggregates existed.
+    """
+    rows = db.execute(
+        db.query(
+            Rating.professor_id,
+            func.count(Rating.id),
+            func.sum(Rating.stars),
+            *[func.sum(case((Rating.stars == n, 1), else_=0)) for n in range(1, 6)],
+        )
+        .group_by(Rating.professor_id)
+        .statement
+    ).all()
+
+    db.query(ProfessorRatingStats).delete()
+    db.add_all(
+        ProfessorRatingStats(
+            professor_id=pid,
+            ratings_count=count,
+            stars_sum=int(total or 0),
+            stars_1=int(s1 or 0), stars_2=int(s2 or 0), stars_3=int(s3 or 0),
+            stars_4=int(s4 or 0), stars_5=int(s5 or 0),
+        )
+        for pid, count, total, s1, s2, s3, s4, s5 in rows
+    )
+    db.commit()
+    return len(rows)
@@ -0,0 +1,298 @@
+"""
+Full-text professor search.
+
+SQLite gets an FTS5 table ranked with bm25(); Postgres gets a weighted
+tsvector table with a GIN index ranked with ts_rank_cd. Which one is used
+follows DATABASE_URL in app.db. In both cases the index is kept in sync
+by database triggers, so every insert path (ORM, bulk insert, raw SQL)
+is covered without application code having to remember it, and renaming
+a department or school reindexes its professors.
+
+Both backends tokenize without stemming (unicode61 / the 'simple' text
+search config), so a query matches the same words on either, and `score`
+is higher-is-better on both (bm25() is negated; it is lower-is-better).
+"""
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db import DATABASE_URL
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# -----------------------------
+# SQLite / FTS5
+# -----------------------------
+_SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS professor_fts USING fts5(
+        name, department, bio, school_name,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS professors_fts_ai AFTER INSERT ON professors BEGIN
+        INSERT INTO professor_fts(rowid, name, department, bio, school_name)
+        VALUES (
+            new.id,
+            new.first_name || ' ' || new.last_name,
+            (SELECT name FROM departments WHERE id = new.department_id),
+            new.bio,
+            (SELECT name FROM schools WHERE id = new.school_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS professors_fts_au AFTER UPDATE ON professors BEGIN
+        DELETE FROM professor_fts WHERE rowid = old.id;
+        INSERT INTO professor_fts(rowid, name, department, bio, school_name)
+        VALUES (
+            new.id,
+            new.first_name || ' ' || new.last_name,
+            (SELECT name FROM departments WHERE id = new.department_id),
+            new.bio,
+            (SELECT name FROM schools WHERE id = new.school_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS professors_fts_ad AFTER DELETE ON professors BEGIN
+        DELETE FROM professor_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS departments_fts_au AFTER UPDATE OF name ON departments BEGIN
+        UPDATE professor_fts SET department = new.name
+        WHERE rowid IN (SELECT id FROM professors WHERE department_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schools_fts_au AFTER UPDATE OF name ON schools BEGIN
+        UPDATE professor_fts SET school_name = new.name
+        WHERE rowid IN (SELECT id FROM professors WHERE school_id = new.id);
+    END
+    """,
+]
+
+_SQLITE_REBUILD = [
+    "DELETE FROM professor_fts",
+    """
+    INSERT INTO professor_fts(rowid, name, department, bio, school_name)
+    SELECT p.id, p.first_name || ' ' || p.last_name, d.name, p.bio, s.name
+    FROM professors p
+    LEFT JOIN departments d ON d.id = p.department_id
+    LEFT JOIN schools s ON s.id = p.school_id
+    """,
+]
+
+# bm25 column weights: name, department, bio, school_name; bm25 is lower-is-better
+_SQLITE_SEARCH = """
+    SELECT p.id, p.first_name, p.last_name, p.level, p.school_id,
+           f.department, f.school_name,
+           -bm25(professor_fts, 10.0, 4.0, 1.0, 2.0) AS score
+    FROM professor_fts f
+    JOIN professors p ON p.id = f.rowid
+    WHERE professor_fts MATCH :query {school_filter}
+    ORDER BY score DESC
+    LIMIT :limit
+"""
+
+# -----------------------------
+# Postgres / tsvector
+# -----------------------------
+_PG_DOCUMENT = """
+    setweight(to_tsvector('simple', coalesce(p.first_name, '') || ' ' || coalesce(p.last_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(d.name, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(s.name, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(p.bio, '')), 'C')
+"""
+
+# bump when _PG_DOCUMENT changes; ensure_search_index then rebuilds the index
+_PG_DOCUMENT_VERSION = "2"
+
+
+def _pg_refresh(where: str) -> str:
+    """Upsert the documents of the professors matching `where` (plpgsql body)."""
+    return f"""
+        INSERT INTO professor_search (professor_id, document)
+        SELECT p.id, {_PG_DOCUMENT}
+        FROM professors p
+        LEFT JOIN departments d ON d.id = p.department_id
+        LEFT JOIN schools s ON s.id = p.school_id
+        WHERE {where}
+        ON CONFLICT (professor_id) DO UPDATE SET document = EXCLUDED.document;
+    """
+
+
+_PG_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS professor_search (
+        professor_id INTEGER PRIMARY KEY REFERENCES professors(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_professor_search_document ON professor_search USING GIN (document)",
+    f"""
+    CREATE OR REPLACE FUNCTION professor_search_refresh() RETURNS trigger AS $$
+    BEGIN
+        {_pg_refresh("p.id = NEW.id")}
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS professors_search_sync ON professors",
+    """
+    CREATE TRIGGER professors_search_sync AFTER INSERT OR UPDATE ON professors
+    FOR EACH ROW EXECUTE FUNCTION professor_search_refresh()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION professor_search_department_renamed() RETURNS trigger AS $$
+    BEGIN
+        {_pg_refresh("p.department_id = NEW.id")}
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS departments_search_sync ON departments",
+    """
+    CREATE TRIGGER departments_search_sync AFTER UPDATE OF name ON departments
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION professor_search_department_renamed()
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION professor_search_school_renamed() RETURNS trigger AS $$
+    BEGIN
+        {_pg_refresh("p.school_id = NEW.id")}
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS schools_search_sync ON schools",
+    """
+    CREATE TRIGGER schools_search_sync AFTER UPDATE OF name ON schools
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION professor_search_school_renamed()
+    """,
+]
+
+_PG_REBUILD = [
+    "DELETE FROM professor_search",
+    f"""
+    INSERT INTO professor_search (professor_id, document)
+    SELECT p.id, {_PG_DOCUMENT}
+    FROM professors p
+    LEFT JOIN departments d ON d.id = p.department_id
+    LEFT JOIN schools s ON s.id = p.school_id
+    """,
+    f"COMMENT ON TABLE professor_search IS 'document v{_PG_DOCUMENT_VERSION}'",
+]
+
+_PG_SEARCH = """
+    SELECT p.id, p.first_name, p.last_name, p.level, p.school_id,
+           d.name AS department, s.name AS school_name,
+           ts_rank_cd(ps.document, q.query) AS score
+    FROM professor_search ps
+    CROSS JOIN to_tsquery('simple', :query) AS q(query)
+    JOIN professors p ON p.id = ps.professor_id
+    LEFT JOIN departments d ON d.id = p.department_id
+    LEFT JOIN schools s ON s.id = p.school_id
+    WHERE ps.document @@ q.query {school_filter}
+    ORDER BY score DESC
+    LIMIT :limit
+"""
+
+_INDEX_TABLE = "professor_fts" if IS_SQLITE else "professor_search"
+
+
+def build_query(raw: str) -> str | None:
+    """
+    Turn free text into a safe match expression: every word must match and
+    the last word matches as a prefix, so typeahead works as the user types.
+    """
+    tokens = _TOKEN_RE.findall(raw.lower())
+    if not tokens:
+        return None
+    if IS_SQLITE:
+        parts = [f'"{t}"' for t in tokens]
+        parts[-1] += "*"
+        return " ".join(parts)
+    parts = list(tokens)
+    parts[-1] += ":*"
+    return " & ".join(parts)
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for stmt in _SQLITE_REBUILD if IS_SQLITE else _PG_REBUILD:
+            conn.execute(text(stmt))
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """
+    Create the index table and sync triggers if missing, and backfill
+    when the index has drifted from the professors table (e.g. rows
+    inserted before the triggers existed) or, on Postgres, was built
+    from an older document definition.
+    """
+    with engine.begin() as conn:
+        for stmt in _SQLITE_DDL if IS_SQLITE else _PG_DDL:
+            conn.execute(text(stmt))
+        indexed = conn.execute(text(f"SELECT count(*) FROM {_INDEX_TABLE}")).scalar()
+        total = conn.execute(text("SELECT count(*) FROM professors")).scalar()
+        stale = not IS_SQLITE and conn.execute(
+            text("SELECT obj_description('professor_search'::regclass, 'pg_class')")
+        ).scalar() != f"document v{_PG_DOCUMENT_VERSION}"
+    if indexed != total or stale:
+        rebuild_search_index(engine)
+
+
+def search_statement(q: str, limit: int = 20, school_id: int | None = None):
+    """The ranked search as a text() statement with bound params, or None for an empty query."""
+    query = build_query(q)
+    if query is None:
+        return None
+    params = {"query": query, "limit": limit}
+    school_filter = ""
+    if school_id is not None:
+        school_filter = "AND p.school_id = :school_id"
+        params["school_id"] = school_id
+    sql = (_SQLITE_SEARCH if IS_SQLITE else _PG_SEARCH).format(school_filter=school_filter)
+    return text(sql).bindparams(**params)
+
+
+def search_result(rows) -> list[dict]:
+    return [
+        {
+            "id": r["id"],
+            "name": f"{r['first_name']} {r['last_name']}",
+            "first_name": r["first_name"],
+            "last_name": r["last_name"],
+            "department": r["department"],
+            "level": r["level"],
+            "school_id": r["school_id"],
+            "school_name": r["school_name"],
+            "score": r["score"],
+        }
+        for r in rows
+    ]
+
+
+def search_professors(db: Session, q: str, limit: int = 20, school_id: int | None = None) -> list[dict]:
+    stmt = search_statement(q, limit=limit, school_id=school_id)
+    if stmt is None:
+        return []
+    return search_result(db.execute(stmt).mappings().all())
+
+
+async def search_professors_async(db: AsyncSession, q: str, limit: int = 20,
+                                  school_id: int | None = None) -> list[dict]:
+    stmt = search_statement(q, limit=limit, school_id=school_id)
+    if stmt is None:
+        return []
+    return search_result((await db.execute(stmt)).mappings().all())
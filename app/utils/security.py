@@ -1,9 +1,14 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+_hash_pool: ProcessPoolExecutor | None = None
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -11,6 +16,41 @@ def hash_password(password: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+def verify_and_update(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """(matches, new hash if the stored one is outdated, e.g. BCRYPT_ROUNDS changed)."""
+    return pwd_context.verify_and_update(plain, hashed)
+
+# -----------------------------
+# Off-loop hashing
+# -----------------------------
+def _pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        # spawn: workers only import this module, never a copy of the server's threads
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_pool
+
+async def _run(fn, *args):
+    # PASSWORD_HASH_WORKERS=0 falls back to the loop's default thread executor
+    executor = _pool() if settings.PASSWORD_HASH_WORKERS > 0 else None
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bounded process pool; the event loop stays free meanwhile."""
+    return await _run(hash_password, password)
+
+async def verify_and_update_async(plain: str, hashed: str) -> tuple[bool, str | None]:
+    return await _run(verify_and_update, plain, hashed)
+
+def shutdown_hash_pool(wait: bool = False) -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=wait, cancel_futures=not wait)
+        _hash_pool = None
+
 def create_access_token(data: dict, expires_minutes: int | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1 @@
+"""Benchmarks; each module runs standalone with `python -m bench.<name>`."""
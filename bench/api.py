@@ -0,0 +1,268 @@
+"""
+Load test of the browse and ratings endpoints against a seeded database.
+
+    python -m bench.api --size 100k [--requests 2000] [--concurrency 16]
+                        [--cache] [--async] [--write-behind] [--database-url URL]
+                        [--seed 42] [--out FILE]
+
+Generates a synthetic dataset (bench.datasets), seeds it through the
+regular seeders (app.seed.seed_schools and parallel import jobs), adds
+ratings, starts the API under uvicorn and drives each endpoint in turn
+with --concurrency in-flight requests. For every endpoint it records
+p50/p95/p99 latency, throughput, errors and SQL statements per request,
+and writes everything to JSON under bench/results/ for bench.compare.
+
+The response cache is off unless --cache is given, so the numbers are
+those of the database path. Each endpoint draws its targets from its own
+generator, seeded from --seed and the endpoint name, so two runs with the
+same --seed request the same targets in the same order.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+from bench.common import Server, configure, percentiles
+from bench.datasets import SIZES, generate, school_count
+
+RATED_PROFESSORS = 10_000
+RATINGS_EACH = 5
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# -----------------------------
+# seeding
+# -----------------------------
+def seed(schools_csv: str, professor_csvs: list[str], professors: int) -> dict:
+    from sqlalchemy import insert
+
+    from app.db import SessionLocal
+    from app.jobs import create_job, run_jobs_parallel
+    from app.models.models import Rating
+    from app.seed import seed_schools
+    from app.utils.ratings import rebuild_stats
+
+    timings = {}
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        seed_schools(db, schools_csv)
+        job_ids = [create_job(db, path).id for path in professor_csvs]
+    results = run_jobs_parallel(job_ids)
+    failed = [r for r in results if r["status"] != "done"]
+    if failed:
+        raise SystemExit(f"seeding failed: {failed}")
+    timings["professors_seconds"] = round(time.perf_counter() - start, 2)
+
+    start = time.perf_counter()
+    rng = random.Random(7)
+    rated = min(professors, RATED_PROFESSORS)
+    with SessionLocal() as db:
+        db.execute(insert(Rating), [
+            {"professor_id": pid, "stars": rng.randint(1, 5), "comment": "synthetic"}
+            for pid in range(1, rated + 1) for _ in range(RATINGS_EACH)
+        ])
+        db.commit()
+        rebuild_stats(db)
+    timings["ratings_seconds"] = round(time.perf_counter() - start, 2)
+    return timings
+
+
+def bench_headers() -> dict:
+    """Authorization for the rating POSTs: a token for the bench user, created on first use."""
+    from app.db import SessionLocal
+    from app.models.models import User
+    from app.utils.security import create_access_token
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == "bench@bench.invalid").first()
+        if user is None:
+            user = User(name="bench", email="bench@bench.invalid", password_hash="!")
+            db.add(user)
+            db.commit()
+        token = create_access_token({"sub": str(user.id)}, expires_minutes=24 * 60)
+    return {"Authorization": f"Bearer {token}"}
+
+
+# -----------------------------
+# load
+# -----------------------------
+def endpoint_plan(professors: int) -> dict:
+    """Route template -> (method, request factory) drawing random but valid targets."""
+    from app.utils.geo import US_STATES
+    from bench.datasets import _DEPARTMENTS
+
+    schools = school_count(professors)
+    rated = min(professors, RATED_PROFESSORS)
+    states = list(US_STATES)
+
+    def search(rng):
+        params = {"page_size": 20}
+        choice = rng.random()
+        if choice < 0.4:
+            params["state"] = rng.choice(states)
+        elif choice < 0.7:
+            params["public_private"] = rng.choice(["Public", "Private"])
+        else:
+            low = rng.randrange(5_000, 50_000, 5_000)
+            params.update(tuition_min=low, tuition_max=low + 15_000)
+        return "/schools/search", params, None
+
+    def school_professors(rng):
+        params = {"page": rng.randint(1, 3), "page_size": 20}
+        if rng.random() < 0.3:
+            params["department"] = rng.choice(_DEPARTMENTS)
+        return f"/schools/{rng.randint(1, schools)}/professors", params, None
+
+    return {
+        "GET /schools/search": ("GET", search),
+        "GET /schools/{id}/professors": ("GET", school_professors),
+        "GET /professors/{id}": ("GET", lambda rng: (f"/professors/{rng.randint(1, professors)}", None, None)),
+        "GET /professors/{id}/ratings": (
+            "GET", lambda rng: (f"/professors/{rng.randint(1, rated)}/ratings", {"limit": 20}, None)),
+        "POST /professors/{id}/ratings": (
+            "POST", lambda rng: (f"/professors/{rng.randint(1, professors)}/ratings", None,
+                                 {"stars": rng.randint(1, 5), "comment": "bench"})),
+    }
+
+
+class QueryCounter:
+    """Counts SQL statements on every engine in the process (sync, async, replicas)."""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_):
+        self.count += 1
+
+
+def endpoint_rng(name: str, seed: int) -> random.Random:
+    """A generator per endpoint; crc32 rather than hash(), which is salted per process."""
+    return random.Random(zlib.crc32(name.encode()) ^ seed)
+
+
+async def run_endpoint(base_url: str, method: str, factory, rng: random.Random, requests: int,
+                       concurrency: int, counter: QueryCounter, headers: dict | None = None) -> dict:
+    import httpx
+
+    latencies, errors, remaining = [], 0, requests
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None) as client:
+        async def worker():
+            nonlocal errors, remaining
+            while remaining > 0:
+                remaining -= 1
+                path, params, body = factory(rng)
+                start = time.perf_counter()
+                r = await client.request(method, path, params=params, json=body)
+                latencies.append(time.perf_counter() - start)
+                errors += r.status_code >= 400
+
+        queries_before = counter.count
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        **percentiles(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round((counter.count - queries_before) / max(len(latencies), 1), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="1k")
+    parser.add_argument("--requests", type=int, default=2000, help="per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--cache", action="store_true", help="leave the response cache on")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="DB_ASYNC=true")
+    parser.add_argument("--write-behind", action="store_true", help="RATINGS_WRITE_BEHIND=true")
+    parser.add_argument("--database-url", help="defaults to a scratch SQLite file")
+    parser.add_argument("--seed", type=int, default=42, help="seeds every endpoint's request mix")
+    parser.add_argument("--data-dir", help="where the CSVs are generated (reused across runs)")
+    parser.add_argument("--out", help="result JSON (default bench/results/<time>-<size>.json)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    configure(CACHE_ENABLED=args.cache, DB_ASYNC=args.use_async, IMPORT_WORKERS=1,
+              RATINGS_WRITE_BEHIND=args.write_behind)
+
+    professors = SIZES[args.size]
+    data_dir = args.data_dir or os.path.join(tempfile.gettempdir(), f"rmp-bench-{args.size}")
+    schools_csv, professor_csvs = generate(professors, data_dir)
+    print(f"dataset: {professors:,} professors, {school_count(professors):,} schools in {data_dir}")
+
+    seeding = seed(schools_csv, professor_csvs, professors)
+    print(f"seeded: {seeding}")
+
+    headers = bench_headers()
+    counter = QueryCounter()
+    results = {}
+    with Server() as server:
+        for name, (method, factory) in endpoint_plan(professors).items():
+            results[name] = asyncio.run(
+                run_endpoint(server.base_url, method, factory, endpoint_rng(name, args.seed),
+                             args.requests, args.concurrency, counter, headers)
+            )
+            r = results[name]
+            print(f"{name:<32} p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f}"
+                  f"  {r['throughput_rps']:>8.1f} req/s  {r['queries_per_request']:>5.2f} q/req"
+                  f"  errors {r['errors']}")
+
+    from sqlalchemy import __version__ as sqlalchemy_version
+    from app.core.config import settings
+
+    stamp = datetime.datetime.now(datetime.timezone.utc)
+    report = {
+        "meta": {
+            "timestamp": stamp.isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "size": args.size,
+            "professors": professors,
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "cache": args.cache,
+            "async": args.use_async,
+            "write_behind": args.write_behind,
+            "database": settings.DATABASE_URL.split(":", 1)[0],
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy_version,
+            "cpus": os.cpu_count(),
+        },
+        "seeding": seeding,
+        "endpoints": results,
+    }
+    out = args.out or os.path.join(
+        os.path.dirname(__file__), "results", f"{stamp:%Y%m%dT%H%M%S}-{args.size}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Helpers shared by the bench scripts: scratch settings, an in-process server, percentiles."""
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+
+def configure(**env) -> str:
+    """
+    Point Settings at a scratch SQLite file (unless DATABASE_URL is passed)
+    and apply `env`. Must run before anything under app.* is imported.
+    Returns the scratch directory.
+    """
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{scratch}/bench.db")
+    for key, value in env.items():
+        os.environ[key] = str(value)
+    return scratch
+
+
+def percentiles(samples: list[float]) -> dict:
+    """Request count plus p50/p95/p99 in milliseconds for durations in seconds."""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "n": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(pick(0.95) * 1000, 2),
+        "p99_ms": round(pick(0.99) * 1000, 2),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Server:
+    """app.main:app under uvicorn on a background thread of this process."""
+
+    def __init__(self):
+        import uvicorn
+        from app.main import app
+
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "Server":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
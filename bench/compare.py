@@ -0,0 +1,61 @@
+"""
+Compare two bench.api result files.
+
+    python -m bench.compare bench/results/OLD.json bench/results/NEW.json [--threshold 10]
+
+Prints p50/p99/throughput/queries per endpoint side by side and exits
+non-zero when any endpoint's p99 or throughput got worse by more than
+--threshold percent, so it can gate a release.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def change(old: float, new: float) -> float:
+    return 100.0 * (new - old) / old if old else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    for key in ("size", "concurrency", "seed", "cache", "async", "write_behind", "database"):
+        if old["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: {key} differs ({old['meta'].get(key)} vs {new['meta'].get(key)})")
+    print(f"{old['meta'].get('git')} -> {new['meta'].get('git')}  ({new['meta']['size']})")
+    print(f"{'endpoint':<32}{'p50 ms':>16}{'p99 ms':>18}{'req/s':>18}{'q/req':>12}")
+
+    regressions = []
+    for name, n in new["endpoints"].items():
+        o = old["endpoints"].get(name)
+        if o is None:
+            print(f"{name:<32}  (new)")
+            continue
+        p99 = change(o["p99_ms"], n["p99_ms"])
+        rps = change(o["throughput_rps"], n["throughput_rps"])
+        print(f"{name:<32}"
+              f"{o['p50_ms']:>7.2f}->{n['p50_ms']:<7.2f}"
+              f"{o['p99_ms']:>8.2f}->{n['p99_ms']:<7.2f}({p99:+.0f}%)"
+              f"{o['throughput_rps']:>8.1f}->{n['throughput_rps']:<7.1f}({rps:+.0f}%)"
+              f"{o['queries_per_request']:>5.1f}->{n['queries_per_request']:<5.1f}")
+        if p99 > args.threshold or rps < -args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"regressed beyond {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
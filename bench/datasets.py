@@ -0,0 +1,91 @@
+"""
+Synthetic CSVs shaped like data/schools.csv and data/*_professors_10.csv.
+
+    python -m bench.datasets --professors 100000 --out /tmp/rmp-100k
+
+Sizes used by bench.api are 1k, 100k and 1M professors. Generation is
+seeded, so the same size always produces the same files.
+"""
+import argparse
+import csv
+import os
+import random
+
+from app.utils.geo import US_STATES
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+ROWS_PER_FILE = 100_000
+PROFESSORS_PER_SCHOOL = 1_000
+
+_FIRST = ["Esra", "Mohammed", "Rafal", "Ashwin", "Irina", "Ahmed", "Maria", "Wei", "Priya", "James",
+          "Olga", "Kwame", "Sofia", "Daniel", "Yuki", "Fatima", "Lucas", "Ana", "Omar", "Grace"]
+_LAST = ["Akbas", "Alser", "Angryk", "Ashok", "Akimova", "Alaa", "Garcia", "Zhang", "Patel", "Smith",
+         "Ivanova", "Mensah", "Rossi", "Cohen", "Tanaka", "Haddad", "Silva", "Lopez", "Nasser", "Kim"]
+_DEPARTMENTS = ["Computer Science", "Data Science", "Mathematics", "Physics", "Chemistry", "Biology",
+                "Economics", "History", "Psychology", "English", "Philosophy", "Electrical Engineering"]
+_TITLES = ["Assistant Professor", "Associate Professor", "Professor", "Lecturer",
+           "Part-Time Instructor", "Distinguished University Professor"]
+_LEVELS = ["UG & Graduate", "UG", "Graduate"]
+_CITIES = ["Springfield", "Riverside", "Franklin", "Greenville", "Fairview", "Madison", "Clinton"]
+
+
+def school_count(professors: int) -> int:
+    return max(10, professors // PROFESSORS_PER_SCHOOL)
+
+
+def write_schools(path: str, n: int, rng: random.Random) -> None:
+    states = list(US_STATES.values())
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "Type", "College Name", "City, State", "Tuition & Fees (approx.)"])
+        for i in range(1, n + 1):
+            public = rng.random() < 0.6
+            in_state = rng.randrange(6_000, 20_000) if public else rng.randrange(45_000, 65_000)
+            tuition = (f"${in_state:,} (in-state), ${in_state * 2 + rng.randrange(5_000):,} (out-of-state)"
+                       if public else f"${in_state:,}")
+            w.writerow([i, "Public" if public else "Private", f"Synthetic University {i}",
+                        f"{rng.choice(_CITIES)}, {rng.choice(states)}", tuition])
+
+
+def write_professors(path: str, ids: range, schools: int, rng: random.Random) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["school_id", "first_name", "last_name", "department", "level", "email", "bio", "rating"])
+        for i in ids:
+            first, last = rng.choice(_FIRST), rng.choice(_LAST)
+            w.writerow([1 + i % schools, first, f"{last}{i}", rng.choice(_DEPARTMENTS),
+                        rng.choice(_LEVELS), f"{first[0].lower()}{last.lower()}{i}@example.edu",
+                        rng.choice(_TITLES), rng.randint(1, 5)])
+
+
+def generate(professors: int, out_dir: str, seed: int = 42) -> tuple[str, list[str]]:
+    """Write the CSVs (skipped if already there); return (schools_csv, professor_csvs)."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    schools = school_count(professors)
+    schools_csv = os.path.join(out_dir, "schools.csv")
+    if not os.path.exists(schools_csv):
+        write_schools(schools_csv, schools, rng)
+
+    files = []
+    for n, start in enumerate(range(0, professors, ROWS_PER_FILE)):
+        path = os.path.join(out_dir, f"synthetic_professors_{n:03d}.csv")
+        if not os.path.exists(path):
+            write_professors(path, range(start, min(start + ROWS_PER_FILE, professors)), schools, rng)
+        files.append(path)
+    return schools_csv, files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--professors", type=int, default=SIZES["1k"])
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    schools_csv, files = generate(args.professors, args.out)
+    print(schools_csv)
+    print("\n".join(files))
+
+
+if __name__ == "__main__":
+    main()
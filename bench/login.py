@@ -0,0 +1,92 @@
+"""
+Login latency under concurrent traffic.
+
+    python -m bench.login [--hash-workers 2] [--rounds 12] [--concurrency 32]
+                          [--seconds 15] [--users 200]
+
+Starts the API with uvicorn on a scratch SQLite file, creates --users
+accounts, then keeps --concurrency logins in flight for --seconds while a
+separate probe hits /health every 50 ms. Prints p50/p95/p99 for both, so a
+run shows login tail latency and whether hashing starves other routes.
+Run it with --hash-workers 0 (the event loop's thread executor) and with
+the default pool to compare.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from bench.common import Server, configure, percentiles
+
+
+def create_users(n: int, password: str) -> list[str]:
+    from sqlalchemy import insert
+    from app.db import SessionLocal
+    from app.models.models import User
+    from app.utils.security import hash_password
+
+    hashed = hash_password(password)   # one hash, shared: only login cost is measured
+    emails = [f"bench{i}@{os.environ.get('ALLOWED_EMAIL_DOMAIN', 'gsu.edu')}" for i in range(n)]
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"email": e, "password_hash": hashed, "role": "user"} for e in emails])
+        db.commit()
+    return emails
+
+
+async def drive(base: str, emails: list[str], password: str, concurrency: int, seconds: float):
+    import httpx
+
+    login_times, probe_times, failures = [], [], 0
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(base_url=base, timeout=None) as client:
+        async def login_worker(i: int):
+            nonlocal failures
+            n = i
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                r = await client.post("/auth/login", json={"email": emails[n % len(emails)], "password": password})
+                login_times.append(time.perf_counter() - start)
+                failures += r.status_code != 200
+                n += concurrency
+
+        async def probe():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/health")
+                probe_times.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(probe(), *(login_worker(i) for i in range(concurrency)))
+    return login_times, probe_times, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure before importing app.*
+    configure(PASSWORD_HASH_WORKERS=args.hash_workers, BCRYPT_ROUNDS=args.rounds)
+
+    password = "correct horse battery staple"
+    with Server() as server:
+        emails = create_users(args.users, password)
+        started = time.perf_counter()
+        logins, probes, failures = asyncio.run(
+            drive(server.base_url, emails, password, args.concurrency, args.seconds)
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"hash workers={args.hash_workers} rounds={args.rounds} "
+          f"concurrency={args.concurrency} cpus={os.cpu_count()}")
+    print(f"login   {percentiles(logins)}  {len(logins) / elapsed:.1f}/s  failures={failures}")
+    print(f"/health {percentiles(probes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Serialization cost of the catalog responses per 1,000 professors.
+
+    python -m bench.serialization [--rows 1000] [--repeat 50]
+
+"before" is the previous implementation (dicts built in Python loops,
+getattr probing, json.dumps over jsonable_encoder); "after" is the
+current one (schemas from app/schemas.py rendered with orjson). Both are
+fed the same in-memory rows, so only shaping + encoding is measured.
+"""
+import argparse
+import json
+import statistics
+import time
+from collections import namedtuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.endpoints.professors import professor_result
+from app.api.endpoints.schools import professors_result
+from app.models.models import Professor, ProfessorRatingStats
+from app.utils.cache import _render
+
+
+# -----------------------------
+# previous implementation, kept verbatim for comparison
+# -----------------------------
+def _before_render(data):
+    return json.dumps(
+        jsonable_encoder(data), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _before_list(rows, page_size):
+    return {
+        "total": len(rows),
+        "page": 1,
+        "page_size": page_size,
+        "next_cursor": None,
+        "items": [
+            {
+                "id": p.id,
+                "name": f"{p.first_name} {p.last_name}",
+                "department": dept_name,
+                "level": p.level,
+                "email": p.email,
+                "rating": p.rating,
+                "bio": p.bio,
+                "school_id": p.school_id,
+            } for p, dept_name in rows
+        ]
+    }
+
+
+def _before_detail(row):
+    prof, dept, stats = row
+    avg_stars = stats.avg_stars if stats else None
+    rating = avg_stars if avg_stars is not None else getattr(prof, "rating", None)
+    return {
+        "id": prof.id,
+        "first_name": getattr(prof, "first_name", None),
+        "last_name": getattr(prof, "last_name", None),
+        "name": getattr(prof, "name", None),
+        "department": dept,
+        "level": getattr(prof, "level", None),
+        "email": getattr(prof, "email", None),
+        "rating": rating,
+        "avg_stars": avg_stars,
+        "ratings_count": stats.ratings_count if stats else 0,
+        "histogram": stats.histogram if stats else [0, 0, 0, 0, 0],
+        "bio": getattr(prof, "bio", None),
+    }
+
+
+# -----------------------------
+# harness
+# -----------------------------
+ListRow = namedtuple(
+    "ListRow", "id last_name first_name department level email rating school_id"
+)
+# the detail query also selects plain columns (app.api.endpoints.professors.DETAIL_COLUMNS)
+DetailRow = namedtuple(
+    "DetailRow", "id first_name last_name level email bio photo_url rating department "
+                 "ratings_count stars_sum stars_1 stars_2 stars_3 stars_4 stars_5"
+)
+
+
+def make_rows(n: int):
+    rows = []
+    for i in range(1, n + 1):
+        prof = Professor(
+            id=i, school_id=1 + i % 10, first_name=f"First{i}", last_name=f"Last{i}",
+            level="UG & Graduate", email=f"p{i}@example.edu", rating=3.5,
+            bio="Associate Professor of Computer Science. " * 3,
+        )
+        stats = ProfessorRatingStats(
+            professor_id=i, ratings_count=10, stars_sum=37,
+            stars_1=0, stars_2=1, stars_3=2, stars_4=3, stars_5=4,
+        )
+        rows.append((prof, "Computer Science", stats))
+    return rows
+
+
+def timed(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    list_rows = [(p, d) for p, d, _ in rows]
+    # the list query now returns projected column tuples rather than entities
+    projected = [
+        ListRow(p.id, p.last_name, p.first_name, d, p.level, p.email, p.rating, p.school_id)
+        for p, d in list_rows
+    ]
+    detail_rows = [
+        DetailRow(p.id, p.first_name, p.last_name, p.level, p.email, p.bio, p.photo_url, p.rating, d,
+                  st.ratings_count, st.stars_sum, *st.histogram)
+        for p, d, st in rows
+    ]
+    cases = {
+        "list_professors": (
+            lambda: _before_render(_before_list(list_rows, args.rows)),
+            lambda: _render(professors_result(projected, args.rows, 1, args.rows, None)),
+        ),
+        "get_professor x N": (
+            lambda: [_before_render(_before_detail(r)) for r in rows],
+            lambda: [_render(professor_result(r)) for r in detail_rows],
+        ),
+    }
+    print(f"{args.rows} professors, median of {args.repeat} runs")
+    print(f"{'case':<20}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, (before, after) in cases.items():
+        b, a = timed(before, args.repeat), timed(after, args.repeat)
+        print(f"{name:<20}{b:>12.2f}{a:>12.2f}{b / a:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Tables as they existed before migrations were introduced. Databases that
+were created with Base.metadata.create_all already have some or all of
+them, so each table is only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(name: str) -> bool:
+    return not sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _missing("schools"):
+        op.create_table(
+            "schools",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(200), nullable=False, unique=True),
+            sa.Column("city", sa.String(120), nullable=True),
+            sa.Column("state", sa.String(80), nullable=True),
+            sa.Column("public_private", sa.String(20), nullable=True),
+            sa.Column("tuition_text", sa.String(255), nullable=True),
+        )
+    if _missing("departments"):
+        op.create_table(
+            "departments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("school_id", sa.Integer(), sa.ForeignKey("schools.id"), nullable=False),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.UniqueConstraint("school_id", "name", name="uq_dept_school_name"),
+        )
+    if _missing("professors"):
+        op.create_table(
+            "professors",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("school_id", sa.Integer(), sa.ForeignKey("schools.id"), nullable=False),
+            sa.Column("department_id", sa.Integer(), sa.ForeignKey("departments.id"), nullable=True),
+            sa.Column("first_name", sa.String(120), nullable=False),
+            sa.Column("last_name", sa.String(120), nullable=False),
+            sa.Column("level", sa.String(50), nullable=True),
+            sa.Column("email", sa.String(180), nullable=True),
+            sa.Column("bio", sa.Text(), nullable=True),
+            sa.Column("rating", sa.Float(), nullable=True),
+            sa.Column("photo_url", sa.String(300), nullable=True),
+            sa.Column("profile_url", sa.String(300), nullable=True),
+        )
+    if _missing("ratings"):
+        op.create_table(
+            "ratings",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("professor_id", sa.Integer(), sa.ForeignKey("professors.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=True),
+            sa.Column("stars", sa.Integer(), nullable=False),
+            sa.Column("comment", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+    if _missing("professor_rating_stats"):
+        op.create_table(
+            "professor_rating_stats",
+            sa.Column("professor_id", sa.Integer(), sa.ForeignKey("professors.id"), primary_key=True),
+            sa.Column("ratings_count", sa.Integer(), nullable=False),
+            sa.Column("stars_sum", sa.Integer(), nullable=False),
+            *[sa.Column(f"stars_{n}", sa.Integer(), nullable=False) for n in range(1, 6)],
+        )
+    if _missing("courses"):
+        op.create_table(
+            "courses",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("department_id", sa.Integer(), sa.ForeignKey("departments.id"), nullable=False),
+            sa.Column("code", sa.String(50), nullable=False),
+            sa.Column("title", sa.String(200), nullable=True),
+            sa.Column("level", sa.String(10), nullable=True),
+        )
+    if _missing("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(120), nullable=True),
+            sa.Column("email", sa.String(200), nullable=False, unique=True),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("role", sa.String(20), nullable=False),
+        )
+    if _missing("import_jobs"):
+        op.create_table(
+            "import_jobs",
+            sa.Column("id", sa.String(32), primary_key=True),
+            sa.Column("kind", sa.String(20), nullable=False),
+            sa.Column("path", sa.String(500), nullable=False),
+            sa.Column("filename", sa.String(255), nullable=True),
+            sa.Column("school_id", sa.Integer(), sa.ForeignKey("schools.id"), nullable=True),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("rows_done", sa.Integer(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("delete_when_done", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for name in ("import_jobs", "users", "courses", "professor_rating_stats",
+                 "ratings", "professors", "departments", "schools"):
+        op.drop_table(name)
@@ -0,0 +1,46 @@
+"""indexes for the hot query columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Each index matches a real query shape:
+- /schools/{id}/professors filters on school_id and orders by (last_name, id)
+- department filters/joins go through professors.department_id
+- /professors/{id}/ratings filters on professor_id, newest first
+- /schools/search filters on state and lower(public_private)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index(table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def upgrade() -> None:
+    indexes = [
+        ("ix_professors_school_last_name", "professors", ["school_id", "last_name", "id"]),
+        ("ix_professors_department_id", "professors", ["department_id"]),
+        ("ix_ratings_professor_created", "ratings", ["professor_id", "created_at", "id"]),
+        ("ix_schools_state", "schools", ["state"]),
+        ("ix_schools_public_private_lower", "schools", [sa.text("lower(public_private)")]),
+    ]
+    for name, table, columns in indexes:
+        if not _has_index(table, name):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_schools_public_private_lower", table_name="schools")
+    op.drop_index("ix_schools_state", table_name="schools")
+    op.drop_index("ix_ratings_professor_created", table_name="ratings")
+    op.drop_index("ix_professors_department_id", table_name="professors")
+    op.drop_index("ix_professors_school_last_name", table_name="professors")
@@ -0,0 +1,72 @@
+"""structured tuition and state columns on schools
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Adds state_code / tuition_in_state / tuition_out_of_state with indexes and
+backfills them from the existing state and tuition_text values.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.geo import parse_tuition, to_state_code
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("schools") as batch:
+        batch.add_column(sa.Column("state_code", sa.String(2), nullable=True))
+        batch.add_column(sa.Column("tuition_in_state", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("tuition_out_of_state", sa.Integer(), nullable=True))
+    op.create_index("ix_schools_state_code", "schools", ["state_code"])
+    op.create_index("ix_schools_tuition_in_state", "schools", ["tuition_in_state"])
+    op.create_index("ix_schools_tuition_out_of_state", "schools", ["tuition_out_of_state"])
+
+    schools = sa.table(
+        "schools",
+        sa.column("id", sa.Integer),
+        sa.column("state", sa.String),
+        sa.column("tuition_text", sa.String),
+        sa.column("state_code", sa.String),
+        sa.column("tuition_in_state", sa.Integer),
+        sa.column("tuition_out_of_state", sa.Integer),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(schools.c.id, schools.c.state, schools.c.tuition_text)).all()
+    updates = []
+    for sid, state, tuition in rows:
+        in_state, out_of_state = parse_tuition(tuition)
+        updates.append({
+            "sid": sid,
+            "state_code": to_state_code(state),
+            "tuition_in_state": in_state,
+            "tuition_out_of_state": out_of_state,
+        })
+    if updates:
+        bind.execute(
+            schools.update()
+            .where(schools.c.id == sa.bindparam("sid"))
+            .values(
+                state_code=sa.bindparam("state_code"),
+                tuition_in_state=sa.bindparam("tuition_in_state"),
+                tuition_out_of_state=sa.bindparam("tuition_out_of_state"),
+            ),
+            updates,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_schools_tuition_out_of_state", table_name="schools")
+    op.drop_index("ix_schools_tuition_in_state", table_name="schools")
+    op.drop_index("ix_schools_state_code", table_name="schools")
+    with op.batch_alter_table("schools") as batch:
+        batch.drop_column("tuition_out_of_state")
+        batch.drop_column("tuition_in_state")
+        batch.drop_column("state_code")
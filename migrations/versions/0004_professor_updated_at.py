@@ -0,0 +1,32 @@
+"""professors.updated_at for incremental exports
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+Adds a nullable, indexed updated_at to professors and stamps existing
+rows with the migration time. New rows get it from the model default
+(SQLite can't ALTER in a column with a CURRENT_TIMESTAMP default).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("professors") as batch:
+        batch.add_column(sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(sa.text("UPDATE professors SET updated_at = CURRENT_TIMESTAMP"))
+    op.create_index("ix_professors_updated_at", "professors", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_professors_updated_at", table_name="professors")
+    with op.batch_alter_table("professors") as batch:
+        batch.drop_column("updated_at")
@@ -0,0 +1,33 @@
+"""import_jobs.owner / heartbeat for claiming jobs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+A worker claims a job by setting owner and heartbeat in one conditional
+UPDATE and refreshes heartbeat with every committed batch. Only jobs
+whose heartbeat is older than IMPORT_JOB_LEASE_SECONDS are picked up
+again, so two API workers (or the API and the CLI) never run the same
+import at once.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("import_jobs") as batch:
+        batch.add_column(sa.Column("owner", sa.String(100), nullable=True))
+        batch.add_column(sa.Column("heartbeat", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("import_jobs") as batch:
+        batch.drop_column("heartbeat")
+        batch.drop_column("owner")
@@ -0,0 +1,48 @@
+"""
+Tests run against a throwaway SQLite file. The environment is set here,
+before anything imports app.core.config, so every test module sees it.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="rmp-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["IMPORT_DIR"] = os.path.join(_tmp, "imports")
+os.environ["PROFILE_DIR"] = os.path.join(_tmp, "profiles")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:   # runs startup, i.e. init_db()
+        yield c
+
+
+@pytest.fixture(scope="session")
+def engine(client):
+    from app.db import engine
+
+    return engine
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    """auth_headers(role) -> an Authorization header for a fresh user with that role."""
+    from app.db import SessionLocal
+    from app.models.models import User
+    from app.utils.security import create_access_token
+
+    def make(role: str = "user") -> dict:
+        with SessionLocal() as db:
+            user = User(name=role, email=f"{os.urandom(6).hex()}@gsu.edu", password_hash="x", role=role)
+            db.add(user)
+            db.commit()
+            token = create_access_token({"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,35 @@
+"""/admin/* is admin-only, and a seeded CSV becomes a finished import job."""
+import time
+
+import pytest
+
+CSV = (b"first_name,last_name,department,level,email,bio,photo_url,profile_url\n"
+       b"Grace,Hopper,Computer Science,Grad,gh@gsu.edu,,,\n"
+       b"Alan,Turing,Mathematics,UG,at@gsu.edu,,,\n")
+
+
+@pytest.mark.parametrize("path", ["/admin/jobs", "/admin/profiles"])
+def test_admin_routes_need_an_admin(client, auth_headers, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers=auth_headers("user")).status_code == 403
+    assert client.get(path, headers=auth_headers("admin")).status_code == 200
+
+
+def test_seed_runs_an_import_job(client, auth_headers):
+    headers = auth_headers("admin")
+    response = client.post("/admin/seed", params={"school_name": "Seeded University"},
+                           files={"file": ("faculty.csv", CSV, "text/csv")}, headers=headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+    for _ in range(100):
+        job = client.get(f"/admin/jobs/{job_id}", headers=headers).json()
+        if job["status"] not in ("queued", "running"):
+            break
+        time.sleep(0.05)
+    assert (job["status"], job["rows_done"]) == ("done", 2)
+
+
+def test_seed_rejects_missing_headers(client, auth_headers):
+    response = client.post("/admin/seed", files={"file": ("bad.csv", b"first_name\nAda\n", "text/csv")},
+                           headers=auth_headers("admin"))
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+"""Requests whose reads are pinned to the primary neither read nor fill the response cache."""
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db import begin_request_routing, end_request_routing
+from app.utils.cache import backend, cached_json
+
+
+def _request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+@pytest.fixture(autouse=True)
+def cache_on(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    backend.clear()
+    yield
+    backend.clear()
+
+
+def _get(path: str, body: dict, read_primary: bool | None = None) -> bytes:
+    token = begin_request_routing(read_primary) if read_primary is not None else None
+    try:
+        return cached_json(_request(path), ["test"], lambda: body).body
+    finally:
+        if token is not None:
+            end_request_routing(token)
+
+
+def test_replica_reads_are_cached():
+    assert _get("/cached", {"v": 1}, read_primary=False) == b'{"v":1}'
+    assert _get("/cached", {"v": 2}, read_primary=False) == b'{"v":1}'
+    assert _get("/cached", {"v": 3}) == b'{"v":1}'   # no replicas configured
+
+
+def test_primary_pinned_reads_bypass_the_cache():
+    # a replica cached a body from before this client's write...
+    assert _get("/pinned", {"v": "stale"}, read_primary=False) == b'{"v":"stale"}'
+    # ...the writer, pinned to the primary, still sees its write
+    assert _get("/pinned", {"v": "fresh"}, read_primary=True) == b'{"v":"fresh"}'
+    # and its primary read did not replace the shared entry either
+    assert _get("/pinned", {"v": "other"}, read_primary=False) == b'{"v":"stale"}'
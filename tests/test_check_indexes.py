@@ -0,0 +1,18 @@
+"""Every hot endpoint query is served from an index (see app.check_indexes)."""
+import pytest
+
+from app.check_indexes import endpoint_statements, explain, full_scans
+
+
+@pytest.mark.parametrize("label, stmt", endpoint_statements(), ids=lambda v: v if isinstance(v, str) else "")
+def test_no_full_table_scans(engine, label, stmt):
+    with engine.connect() as conn:
+        plan = explain(conn, stmt)
+    assert plan
+    assert full_scans(plan, conn.dialect.name) == [], "\n".join(plan)
+
+
+def test_full_scans_detects_a_scan():
+    assert full_scans(["SCAN professors"], "sqlite") == ["SCAN professors"]
+    assert full_scans(["SCAN professors USING INDEX ix_professors_school_last_name"], "sqlite") == []
+    assert full_scans(["Seq Scan on professors  (cost=0.00..1.00 rows=1 width=4)"], "postgresql")
@@ -0,0 +1,40 @@
+"""/export/* streams catalog data to admins only."""
+import orjson
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/export/professors", "/export/ratings"])
+def test_exports_need_an_admin(client, auth_headers, path):
+    params = {"format": "csv"}
+    assert client.get(path, params=params).status_code == 401
+    assert client.get(path, params=params, headers=auth_headers("user")).status_code == 403
+    response = client.get(path, params=params, headers=auth_headers("admin"))
+    assert response.status_code == 200
+    assert response.text.splitlines()[0].startswith("id,")
+
+
+@pytest.mark.parametrize("since", ["2030-01-02T03:04:05", "2030-01-02T03:04:05Z", "2030-01-02T05:04:05.250+02:00"])
+def test_updated_since_includes_the_boundary_second(client, auth_headers, engine, since):
+    from sqlalchemy import text
+
+    from app.db import SessionLocal
+    from app.models.models import Professor, School
+
+    with SessionLocal() as db:
+        school = School(name=f"Export Boundary {since}")
+        db.add(school)
+        db.flush()
+        prof = Professor(school_id=school.id, first_name="Ada", last_name="Lovelace")
+        db.add(prof)
+        db.commit()
+        school_id, prof_id = school.id, prof.id
+    with engine.begin() as conn:   # the format CURRENT_TIMESTAMP writes
+        conn.execute(text("UPDATE professors SET updated_at = '2030-01-02 03:04:05' WHERE id = :id"), {"id": prof_id})
+
+    def exported(updated_since):
+        response = client.get("/export/professors", headers=auth_headers("admin"),
+                              params={"format": "ndjson", "school_id": school_id, "updated_since": updated_since})
+        return [row["id"] for row in map(orjson.loads, response.text.splitlines())]
+
+    assert exported(since) == [prof_id]
+    assert exported("2030-01-02T03:04:06Z") == []
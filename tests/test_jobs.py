@@ -0,0 +1,62 @@
+"""Import jobs are claimed once; only an expired lease lets another worker take over."""
+import datetime
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.jobs import claim_job, create_job, resume_jobs, run_job
+from app.models.models import ImportJob, School
+
+CSV = ("first_name,last_name,department,level,email,bio,photo_url,profile_url\n"
+       "Ada,Lovelace,Mathematics,UG,al@gsu.edu,,,\n")
+
+
+def _job(tmp_path, **values):
+    path = tmp_path / "faculty.csv"
+    path.write_text(CSV)
+    with SessionLocal() as db:
+        school = School(name=f"Jobs Test {tmp_path.name}")
+        db.add(school)
+        db.commit()
+        job = create_job(db, str(path), school_id=school.id)
+        if values:
+            db.execute(update(ImportJob).where(ImportJob.id == job.id).values(**values))
+            db.commit()
+        return job.id
+
+
+def test_a_job_is_claimed_once(client, tmp_path):
+    job_id = _job(tmp_path)
+    with SessionLocal() as db:
+        assert claim_job(db, job_id, "a:1")
+        assert not claim_job(db, job_id, "b:2")
+    # the holder's lease is fresh, so run_job leaves it alone
+    assert run_job(job_id)["status"] == "running"
+    assert job_id not in resume_jobs()
+
+
+def test_an_expired_lease_is_taken_over(client, tmp_path):
+    stale = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=settings.IMPORT_JOB_LEASE_SECONDS + 5)
+    job_id = _job(tmp_path, status="running", owner="gone:1", heartbeat=stale)
+    with SessionLocal() as db:
+        assert claim_job(db, job_id, "b:2")
+    with SessionLocal() as db:
+        db.execute(update(ImportJob).where(ImportJob.id == job_id).values(heartbeat=stale))
+        db.commit()
+    result = run_job(job_id)
+    assert (result["status"], result["rows_done"]) == ("done", 1)
+
+
+def test_resume_only_requeues_failed_jobs(client, auth_headers, tmp_path):
+    headers = auth_headers("admin")
+    job_id = _job(tmp_path, status="running", owner="a:1",
+                  heartbeat=datetime.datetime.now(datetime.timezone.utc))
+    assert client.post(f"/admin/jobs/{job_id}/resume", headers=headers).status_code == 409
+    assert client.post("/admin/jobs/nope/resume", headers=headers).status_code == 404
+    with SessionLocal() as db:
+        db.execute(update(ImportJob).where(ImportJob.id == job_id).values(status="failed"))
+        db.commit()
+    assert client.post(f"/admin/jobs/{job_id}/resume", headers=headers).status_code == 202
+    assert client.post(f"/admin/jobs/{job_id}/resume", headers=headers).status_code == 409
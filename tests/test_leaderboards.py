@@ -0,0 +1,52 @@
+"""A rating is counted once on a leaderboard, even if the board is rebuilt mid-write."""
+import pytest
+
+from app.db import SessionLocal
+from app.models.models import Professor, School
+from app.utils.cache import invalidate_professor
+from app.utils.leaderboards import leaderboards
+from app.utils.ratings import add_rating
+
+
+@pytest.fixture
+def school(client, request):
+    with SessionLocal() as db:
+        school = School(name=f"Leaderboard Test {request.node.name}")
+        db.add(school)
+        db.flush()
+        prof = Professor(school_id=school.id, first_name="Lee", last_name="Board")
+        db.add(prof)
+        db.commit()
+        return school.id, prof.id
+
+
+def _count(db, school_id, pid):
+    return leaderboards.board(db, school_id).entries[pid]["count"]
+
+
+def test_rating_is_applied_in_place(school):
+    school_id, pid = school
+    with SessionLocal() as db:
+        board = leaderboards.board(db, school_id)
+        before = leaderboards.snapshot(school_id)
+        add_rating(db, pid, 5)
+        invalidate_professor(pid, school_id)
+        leaderboards.record(school_id, [(pid, 5)], before)
+        assert leaderboards.board(db, school_id) is board
+        assert _count(db, school_id, pid) == 1
+
+
+@pytest.mark.parametrize("rebuild_after_invalidate", [False, True])
+def test_board_rebuilt_during_the_write_is_not_double_counted(school, rebuild_after_invalidate):
+    school_id, pid = school
+    with SessionLocal() as db:
+        leaderboards.board(db, school_id)
+        before = leaderboards.snapshot(school_id)
+        add_rating(db, pid, 4)
+        if not rebuild_after_invalidate:
+            leaderboards.build(db, school_id)      # between commit and invalidate
+        invalidate_professor(pid, school_id)
+        if rebuild_after_invalidate:
+            leaderboards.board(db, school_id)      # between invalidate and record
+        leaderboards.record(school_id, [(pid, 4)], before)
+        assert _count(db, school_id, pid) == 1
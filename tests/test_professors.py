@@ -0,0 +1,58 @@
+"""/professors?ids= and /professors/batch validate ids before they reach the database."""
+import pytest
+
+
+@pytest.mark.parametrize("ids", ["99999999999999999999", str(2**63), "0", "-3", "1,x"])
+def test_out_of_range_or_malformed_ids_are_400(client, ids):
+    response = client.get("/professors", params={"ids": ids})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "ids must be comma-separated integers"
+
+
+def test_largest_id_is_accepted(client):
+    assert client.get("/professors", params={"ids": str(2**63 - 1)}).json() == {"items": [], "missing": [2**63 - 1]}
+
+
+def test_batch_body_ids_are_checked_too(client):
+    assert client.post("/professors/batch", json={"ids": [1, 2**64]}).status_code == 400
+
+
+def test_detail_reads_only_the_columns_it_returns(client):
+    from app.api.endpoints.professors import professor_statement
+
+    selected = {c.name for c in professor_statement(1).selected_columns}
+    assert "profile_url" not in selected and "updated_at" not in selected
+
+
+def test_detail_and_batch_shapes(client, auth_headers):
+    from app.db import SessionLocal
+    from app.models.models import Department, Professor, School
+
+    with SessionLocal() as db:
+        school = School(name="Detail Test University")
+        db.add(school)
+        db.flush()
+        dept = Department(school_id=school.id, name="Chemistry")
+        db.add(dept)
+        db.flush()
+        rated = Professor(school_id=school.id, department_id=dept.id, first_name="Marie", last_name="Curie",
+                          bio="Radioactivity", rating=4.0)
+        unrated = Professor(school_id=school.id, first_name="Otto", last_name="Hahn", rating=3.5)
+        db.add_all([rated, unrated])
+        db.commit()
+        rated_id, unrated_id = rated.id, unrated.id
+
+    headers = auth_headers()
+    for stars in (5, 4):
+        client.post(f"/professors/{rated_id}/ratings", json={"stars": stars}, headers=headers)
+
+    detail = client.get(f"/professors/{rated_id}").json()
+    assert (detail["name"], detail["department"], detail["bio"]) == ("Marie Curie", "Chemistry", "Radioactivity")
+    assert (detail["avg_stars"], detail["rating"], detail["ratings_count"]) == (4.5, 4.5, 2)
+    assert detail["histogram"] == [0, 0, 0, 1, 1]
+
+    batch = client.get("/professors", params={"ids": f"{unrated_id},{rated_id}"}).json()
+    assert [p["id"] for p in batch["items"]] == [unrated_id, rated_id]
+    other = batch["items"][0]
+    assert (other["avg_stars"], other["rating"], other["ratings_count"], other["histogram"]) == (
+        None, 3.5, 0, [0, 0, 0, 0, 0])
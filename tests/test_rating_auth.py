@@ -0,0 +1,59 @@
+"""Posting a rating takes a bearer token, and the rating records who posted it."""
+import pytest
+from jose import jwt
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.models import Professor, School
+from app.utils.rating_buffer import rating_buffer
+
+
+@pytest.fixture(scope="module")
+def professor_id(client):
+    with SessionLocal() as db:
+        school = School(name="Rating Auth College")
+        db.add(school)
+        db.flush()
+        prof = Professor(school_id=school.id, first_name="Rita", last_name="Levi")
+        db.add(prof)
+        db.commit()
+        return prof.id
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"Authorization": "Bearer not-a-token"},
+    {"Authorization": "Bearer " + jwt.encode({"sub": "999999"}, settings.JWT_SECRET,
+                                              algorithm=settings.JWT_ALGORITHM)},
+])
+def test_rating_needs_a_valid_token(client, professor_id, headers):
+    response = client.post(f"/professors/{professor_id}/ratings", json={"stars": 4}, headers=headers)
+    assert response.status_code == 401
+
+
+def test_rating_records_the_user(client, auth_headers, professor_id):
+    headers = auth_headers()
+    response = client.post(f"/professors/{professor_id}/ratings", json={"stars": 4}, headers=headers)
+    assert response.status_code == 201
+    rating = response.json()
+    assert rating["user_id"] is not None
+    listed = client.get(f"/professors/{professor_id}/ratings").json()
+    assert [r["user_id"] for r in listed if r["id"] == rating["id"]] == [rating["user_id"]]
+
+
+def test_write_behind_rating_records_the_user(client, auth_headers, professor_id, monkeypatch):
+    monkeypatch.setattr(settings, "RATINGS_WRITE_BEHIND", True)
+    rating_buffer.start()
+    try:
+        response = client.post(f"/professors/{professor_id}/ratings", json={"stars": 2},
+                               headers=auth_headers())
+        assert response.status_code == 202
+    finally:
+        rating_buffer.stop()
+    listed = client.get(f"/professors/{professor_id}/ratings").json()
+    assert [r["stars"] for r in listed if r["user_id"] is not None].count(2) == 1
+
+
+@pytest.mark.parametrize("params", [{"limit": -1}, {"limit": 0}, {"limit": 101}, {"offset": -1}])
+def test_rating_list_bounds(client, professor_id, params):
+    assert client.get(f"/professors/{professor_id}/ratings", params=params).status_code == 422
@@ -0,0 +1,37 @@
+"""A batch that keeps failing is split so only the bad ratings are dropped."""
+from sqlalchemy import func, select
+
+from app.db import SessionLocal
+from app.models.models import Professor, Rating, School
+from app.utils import rating_buffer as rb
+
+
+def test_only_failing_ratings_are_dropped(client, monkeypatch):
+    with SessionLocal() as db:
+        school = School(name="Buffer Test College")
+        db.add(school)
+        db.flush()
+        prof = Professor(school_id=school.id, first_name="Bea", last_name="Buffer")
+        db.add(prof)
+        db.commit()
+        pid = prof.id
+
+    real_write = rb.write_batch
+
+    def write_batch(batch):
+        if any(p.comment == "poison" for p in batch):
+            raise RuntimeError("bad row")
+        real_write(batch)
+
+    monkeypatch.setattr(rb, "write_batch", write_batch)
+    monkeypatch.setattr(rb.time, "sleep", lambda _: None)
+    buffer = rb.RatingBuffer()
+    batch = [rb.PendingRating(pid, None, 1 + i % 5, "poison" if i in (3, 11) else None) for i in range(16)]
+    buffer._flush(batch)
+
+    stats = buffer.stats()
+    assert (stats["written"], stats["dropped"]) == (14, 2)
+    # one flush, no whole batch committed; the halves are counted apart
+    assert stats["batches"] == 0 and stats["isolation_writes"] > 0
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).where(Rating.professor_id == pid)) == 14
@@ -0,0 +1,39 @@
+"""Aggregate rows stay equal to what rebuild_stats derives from the ratings table."""
+import random
+
+from sqlalchemy import insert, select
+
+from app.db import SessionLocal
+from app.models.models import Professor, ProfessorRatingStats, Rating, School
+from app.utils.ratings import add_rating, apply_ratings, rebuild_stats
+
+STATS = ("ratings_count", "stars_sum", "stars_1", "stars_2", "stars_3", "stars_4", "stars_5")
+
+
+def _snapshot(db):
+    return {row.professor_id: tuple(getattr(row, c) for c in STATS)
+            for row in db.scalars(select(ProfessorRatingStats))}
+
+
+def test_single_and_bulk_upserts_match_a_rebuild(client):
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        school = School(name="Ratings Test College")
+        db.add(school)
+        db.flush()
+        pids = [db.scalar(insert(Professor).values(school_id=school.id, first_name="P", last_name=str(i))
+                          .returning(Professor.id)) for i in range(6)]
+        db.commit()
+
+        # first ratings create the row, later ones add to it
+        for _ in range(20):
+            add_rating(db, rng.choice(pids[:3]), rng.randint(1, 5))
+        # a batch mixing professors with and without a row, and repeats
+        batch = [(rng.choice(pids), rng.randint(1, 5)) for _ in range(50)]
+        db.execute(insert(Rating), [{"professor_id": p, "stars": s} for p, s in batch])
+        apply_ratings(db, batch)
+        db.commit()
+
+        incremental = _snapshot(db)
+        rebuild_stats(db)
+        assert _snapshot(db) == incremental
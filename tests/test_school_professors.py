@@ -0,0 +1,113 @@
+"""
+/schools/{id}/professors must cost a fixed number of statements however
+many professors a school has and whichever filters are applied: one
+existence check, one count (unless include_total=false) and one page.
+"""
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+
+from app.db import SessionLocal
+from app.models.models import Department, Professor, School
+from app.utils.pagination import encode_cursor
+
+FACULTY_SIZES = {"Tiny College": 0, "Mid State": 7, "Big University": 250}
+DEPARTMENTS = ("Biology", "History", "Mathematics")
+
+
+@pytest.fixture(scope="module")
+def schools(client):
+    ids = {}
+    with SessionLocal() as db:
+        for name, size in FACULTY_SIZES.items():
+            school = School(name=name, city="Atlanta", state="Georgia", state_code="GA")
+            db.add(school)
+            db.flush()
+            depts = [Department(school_id=school.id, name=d) for d in DEPARTMENTS]
+            db.add_all(depts)
+            db.flush()
+            if size:
+                db.execute(insert(Professor), [
+                    {"school_id": school.id, "department_id": depts[i % len(depts)].id,
+                     "first_name": f"First{i}", "last_name": f"Last{i:04d}",
+                     "level": "Grad" if i % 2 else "UG"}
+                    for i in range(size)
+                ])
+            ids[name] = school.id
+        db.commit()
+    return ids
+
+
+@pytest.fixture
+def statements(client):
+    # every Engine, so the async router's engine (DB_ASYNC=true) is counted too
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(Engine, "before_cursor_execute", count)
+
+
+FILTERS = [
+    {},
+    {"level": "Grad"},
+    {"department": "history"},
+    {"search": "last00"},
+    {"level": "UG", "department": "Biology", "search": "First"},
+    {"page": 2, "page_size": 5},
+    {"fields": "id,name,department,bio"},
+]
+
+
+@pytest.mark.parametrize("school", FACULTY_SIZES)
+@pytest.mark.parametrize("params", FILTERS)
+@pytest.mark.parametrize("include_total", [True, False])
+def test_statement_count_is_constant(client, schools, statements, school, params, include_total):
+    response = client.get(f"/schools/{schools[school]}/professors",
+                          params={**params, "include_total": include_total})
+    assert response.status_code == 200
+    assert len(statements) == (3 if include_total else 2), statements
+
+
+@pytest.mark.parametrize("include_total", [True, False])
+def test_cursor_pages_cost_the_same(client, schools, statements, include_total):
+    url = f"/schools/{schools['Big University']}/professors"
+    params = {"page_size": 50, "include_total": include_total}
+    seen = []
+    body = client.get(url, params=params).json()
+    while True:
+        seen.extend(item["id"] for item in body["items"])
+        assert len(statements) == (3 if include_total else 2)
+        if not body["next_cursor"]:
+            break
+        statements.clear()
+        body = client.get(url, params={**params, "cursor": body["next_cursor"]}).json()
+    assert len(seen) == len(set(seen)) == FACULTY_SIZES["Big University"]
+
+
+def test_unknown_school_stops_after_the_existence_check(client, statements):
+    assert client.get("/schools/999999/professors").status_code == 404
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("params", [{"page": 0}, {"page": -1}, {"page_size": 0}, {"page_size": -5},
+                                    {"page_size": 101}])
+def test_paging_bounds(client, schools, params):
+    assert client.get(f"/schools/{schools['Mid State']}/professors", params=params).status_code == 422
+    assert client.get("/schools/search", params=params).status_code == 422
+
+
+@pytest.mark.parametrize("values", [[[1]], ["1"], [True], [2**63], [-1], [1, 2], {"id": 1}])
+def test_search_rejects_malformed_cursors(client, values):
+    token = encode_cursor(*values) if isinstance(values, list) else encode_cursor(values)
+    assert client.get("/schools/search", params={"cursor": token}).status_code == 400
+
+
+@pytest.mark.parametrize("values", [[1, 2], ["Smith", "2"], ["Smith", None], [["Smith"], 2], ["Smith"]])
+def test_professors_rejects_malformed_cursors(client, schools, values):
+    response = client.get(f"/schools/{schools['Mid State']}/professors",
+                          params={"cursor": encode_cursor(*values)})
+    assert response.status_code == 400
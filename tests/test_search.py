@@ -0,0 +1,31 @@
+"""Professor search: higher score ranks first, and renames reach the index."""
+from sqlalchemy import update
+
+from app.db import SessionLocal
+from app.models.models import Department, Professor, School
+from app.utils.search import search_professors
+
+
+def test_score_is_higher_is_better_and_renames_are_indexed(client):
+    with SessionLocal() as db:
+        school = School(name="Search Test Institute")
+        db.add(school)
+        db.flush()
+        dept = Department(school_id=school.id, name="Astronomy")
+        db.add(dept)
+        db.flush()
+        db.add_all([
+            Professor(school_id=school.id, department_id=dept.id, first_name="Vera", last_name="Rubin"),
+            Professor(school_id=school.id, first_name="Ada", last_name="Smith", bio="Rubin taught me"),
+        ])
+        db.commit()
+
+        items = search_professors(db, "rubin", school_id=school.id)
+        assert [i["last_name"] for i in items] == ["Rubin", "Smith"]   # name outweighs bio
+        assert items[0]["score"] > items[1]["score"] > 0
+
+        db.execute(update(Department).where(Department.id == dept.id).values(name="Astrophysics"))
+        db.execute(update(School).where(School.id == school.id).values(name="Renamed Institute"))
+        db.commit()
+        (hit,) = search_professors(db, "astrophysics renamed", school_id=school.id)
+        assert (hit["department"], hit["school_name"]) == ("Astrophysics", "Renamed Institute")
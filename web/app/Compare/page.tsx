@@ -1,7 +1,8 @@
 "use client";
 import { useState } from "react";
 import { useQuery, useQueryClient } from "@tanstack/react-query";
-import api from "@/lib/api";
+import api, { useAuthToken } from "@/lib/api";
+import SignInForm from "@/components/SignInForm";
 
 type ProfItem = {
   id: number;
@@ -36,6 +37,19 @@ export default function ComparePage() {
     setSelected(s => s.filter(x => x.id !== id));
   }
 
+  // one batch request for every selected professor instead of two per card
+  const ids = selected.map(p => p.id);
+  const detailsQuery = useQuery({
+    queryKey: ["compare", ids],
+    enabled: ids.length > 0,
+    queryFn: async () => {
+      const res = await api.get(`/professors?ids=${ids.join(",")}`);
+      const byId: Record<number, any> = {};
+      (res.data.items || []).forEach((d: any) => { byId[d.id] = d; });
+      return byId;
+    }
+  });
+
   return (
     <div className="space-y-6">
       <h1 className="text-2xl font-semibold">Compare Professors</h1>
@@ -71,33 +85,23 @@ export default function ComparePage() {
       <div className="grid md:grid-cols-2 gap-4">
         {selected.length === 0 && <p className="text-gray-600">No professors selected. Use the search above to add them.</p>}
         {selected.map(p => (
-          <ProfessorCompareCard key={p.id} prof={p} onRemove={() => removeProfessor(p.id)} qc={qc} />
+          <ProfessorCompareCard key={p.id} prof={p} details={detailsQuery.data?.[p.id]} onRemove={() => removeProfessor(p.id)} qc={qc} />
         ))}
       </div>
     </div>
   );
 }
 
-function ProfessorCompareCard({ prof, onRemove, qc }: { prof: ProfItem; onRemove: () => void; qc: any }) {
-  const profQuery = useQuery({
-    queryKey: ["prof", prof.id],
-    queryFn: async () => (await api.get(`/professors/${prof.id}`)).data,
-  });
-
-  const ratingsQuery = useQuery({
-    queryKey: ["ratings", prof.id],
-    queryFn: async () => (await api.get(`/professors/${prof.id}/ratings`)).data,
-  });
-
+function ProfessorCompareCard({ prof, details, onRemove, qc }: { prof: ProfItem; details?: any; onRemove: () => void; qc: any }) {
   const [stars, setStars] = useState<number>(5);
   const [comment, setComment] = useState<string>("");
+  const token = useAuthToken();
 
   async function submitRating() {
     try {
       await api.post(`/professors/${prof.id}/ratings`, { stars, comment });
       // refresh
-      qc.invalidateQueries({ queryKey: ["ratings", prof.id] });
-      qc.invalidateQueries({ queryKey: ["prof", prof.id] });
+      qc.invalidateQueries({ queryKey: ["compare"] });
       setComment("");
       alert("Rating submitted");
     } catch (err: any) {
@@ -105,16 +109,8 @@ function ProfessorCompareCard({ prof, onRemove, qc }: { prof: ProfItem; onRemove
     }
   }
 
-  // build a simple histogram
-  const histogram = (() => {
-    const arr = ratingsQuery.data || [];
-    const counts = [0,0,0,0,0]; // index 0->star1
-    arr.forEach((r: any) => {
-      const s = Number(r.stars);
-      if (s >= 1 && s <= 5) counts[s-1] += 1;
-    });
-    return counts;
-  })();
+  // index 0->star1, straight from the server-side rating aggregate
+  const histogram: number[] = details?.histogram || [0,0,0,0,0];
 
   return (
     <div className="border rounded p-4 bg-white">
@@ -128,8 +124,8 @@ function ProfessorCompareCard({ prof, onRemove, qc }: { prof: ProfItem; onRemove
 
       <div className="mt-3">
         <div className="text-sm">Average</div>
-        <div className="text-3xl font-extrabold">{profQuery.data?.avg_stars ?? "—"}</div>
-        <div className="text-xs text-gray-500">{profQuery.data?.ratings_count ?? 0} ratings</div>
+        <div className="text-3xl font-extrabold">{details?.avg_stars ?? "—"}</div>
+        <div className="text-xs text-gray-500">{details?.ratings_count ?? 0} ratings</div>
       </div>
 
       <div className="mt-3">
@@ -151,14 +147,18 @@ function ProfessorCompareCard({ prof, onRemove, qc }: { prof: ProfItem; onRemove
       </div>
 
       <div className="mt-3 border-t pt-3">
-        <div className="flex items-center gap-2">
-          <label className="text-sm">Your rating</label>
-          <select value={stars} onChange={e => setStars(Number(e.target.value))} className="border p-1 rounded">
-            {[1,2,3,4,5].map(n => <option key={n} value={n}>{n}</option>)}
-          </select>
-          <input value={comment} onChange={e => setComment(e.target.value)} placeholder="Optional comment" className="flex-1 border p-1 rounded" />
-          <button onClick={submitRating} className="px-3 py-1 rounded bg-black text-white">Submit</button>
-        </div>
+        {token ? (
+          <div className="flex items-center gap-2">
+            <label className="text-sm">Your rating</label>
+            <select value={stars} onChange={e => setStars(Number(e.target.value))} className="border p-1 rounded">
+              {[1,2,3,4,5].map(n => <option key={n} value={n}>{n}</option>)}
+            </select>
+            <input value={comment} onChange={e => setComment(e.target.value)} placeholder="Optional comment" className="flex-1 border p-1 rounded" />
+            <button onClick={submitRating} className="px-3 py-1 rounded bg-black text-white">Submit</button>
+          </div>
+        ) : (
+          <SignInForm prompt="Sign in to rate this professor" />
+        )}
       </div>
     </div>
   );
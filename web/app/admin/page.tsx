@@ -1,10 +1,12 @@
 "use client";
 import { useState } from "react";
-import api from "@/lib/api";
+import api, { useAuthToken } from "@/lib/api";
+import SignInForm from "@/components/SignInForm";
 
 export default function AdminPage() {
   const [file, setFile] = useState<File | null>(null);
   const [msg, setMsg] = useState("");
+  const token = useAuthToken();
 
   const upload = async () => {
     if (!file) return;
@@ -13,7 +15,15 @@ export default function AdminPage() {
     setMsg("Uploading…");
     try {
       const res = await api.post("/admin/seed", fd, { headers: { "Content-Type": "multipart/form-data" } });
-      setMsg(`Inserted ${res.data.inserted} professors`);
+      // import runs in the background; poll its progress
+      const jobId = res.data.job_id;
+      for (;;) {
+        const job = (await api.get(`/admin/jobs/${jobId}`)).data;
+        if (job.status === "done") { setMsg(`Inserted ${job.rows_done} professors`); break; }
+        if (job.status === "failed") { setMsg(job.error || "Import failed"); break; }
+        setMsg(`Importing… ${job.rows_done} rows`);
+        await new Promise(r => setTimeout(r, 1000));
+      }
     } catch (e: any) {
       setMsg(e?.response?.data?.detail || "Upload failed");
     }
@@ -22,8 +32,13 @@ export default function AdminPage() {
   return (
     <div className="space-y-4 max-w-lg">
       <h2 className="text-xl font-semibold">Admin: Upload Professors CSV</h2>
-      <input type="file" accept=".csv" onChange={e=>setFile(e.target.files?.[0] || null)} />
-      <button onClick={upload} className="px-4 py-2 rounded bg-black text-white">Upload</button>
+      <SignInForm prompt="Sign in with an admin account to upload" />
+      {token && (
+        <>
+          <input type="file" accept=".csv" onChange={e=>setFile(e.target.files?.[0] || null)} />
+          <button onClick={upload} className="px-4 py-2 rounded bg-black text-white">Upload</button>
+        </>
+      )}
       {msg && <p className="text-sm">{msg}</p>}
     </div>
   );
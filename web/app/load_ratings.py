@@ -1,19 +1,22 @@
 import csv
 from app.db import SessionLocal
 from app.models.models import Rating
+from app.utils.ratings import apply_rating
 
 def main():
     with SessionLocal() as db:
         with open("data/ratings.csv", newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
+                stars = int(float(row["stars"]))
                 rating = Rating(
                     user_id=0,  
                     professor_id=int(row["professor_id"]),
-                    stars=float(row["stars"]),
+                    stars=stars,
                     comment=row.get("comment")
                 )
                 db.add(rating)
+                apply_rating(db, rating.professor_id, stars)
         db.commit()
         print("Ratings inserted successfully!")
 
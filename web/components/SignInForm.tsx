@@ -0,0 +1,42 @@
+"use client";
+import { FormEvent, useState } from "react";
+import { login, logout, useAuthToken } from "@/lib/api";
+
+export default function SignInForm({ prompt = "Sign in" }: { prompt?: string }) {
+  const token = useAuthToken();
+  const [email, setEmail] = useState("");
+  const [password, setPassword] = useState("");
+  const [error, setError] = useState("");
+
+  if (token) {
+    return (
+      <div className="flex items-center gap-2 text-sm text-gray-600">
+        Signed in
+        <button onClick={logout} className="underline">Sign out</button>
+      </div>
+    );
+  }
+
+  async function submit(e: FormEvent) {
+    e.preventDefault();
+    setError("");
+    try {
+      await login(email, password);
+      setPassword("");
+    } catch (err: any) {
+      setError(err?.response?.data?.detail || "Sign in failed");
+    }
+  }
+
+  return (
+    <form onSubmit={submit} className="space-y-2">
+      <div className="text-sm">{prompt}</div>
+      <div className="flex items-center gap-2">
+        <input type="email" value={email} onChange={e => setEmail(e.target.value)} placeholder="Email" className="flex-1 border p-1 rounded" required />
+        <input type="password" value={password} onChange={e => setPassword(e.target.value)} placeholder="Password" className="flex-1 border p-1 rounded" required />
+        <button type="submit" className="px-3 py-1 rounded bg-black text-white">Sign in</button>
+      </div>
+      {error && <p className="text-sm text-red-600">{error}</p>}
+    </form>
+  );
+}
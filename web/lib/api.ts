@@ -1,12 +1,54 @@
 import axios from "axios";
+import { useSyncExternalStore } from "react";
 
 const api = axios.create({
   baseURL: process.env.NEXT_PUBLIC_API_BASE,
 });
 
+// The bearer token from /auth/login, kept in localStorage so it survives
+// reloads; rating POSTs and /admin/* need it.
+const TOKEN_KEY = "rmp_token";
+const listeners = new Set<() => void>();
+let currentToken: string | undefined;
+
 export function setAuthToken(token?: string) {
+  currentToken = token;
   if (token) api.defaults.headers.common["Authorization"] = `Bearer ${token}`;
   else delete api.defaults.headers.common["Authorization"];
+  if (typeof window !== "undefined") {
+    if (token) window.localStorage.setItem(TOKEN_KEY, token);
+    else window.localStorage.removeItem(TOKEN_KEY);
+  }
+  listeners.forEach(notify => notify());
+}
+
+if (typeof window !== "undefined") {
+  setAuthToken(window.localStorage.getItem(TOKEN_KEY) || undefined);
+}
+
+export async function login(email: string, password: string) {
+  const res = await api.post("/auth/login", { email, password });
+  setAuthToken(res.data.access_token);
+}
+
+export function logout() {
+  setAuthToken(undefined);
+}
+
+// an expired or revoked token: forget it so the UI asks to sign in again
+api.interceptors.response.use(undefined, err => {
+  if (err?.response?.status === 401 && currentToken) setAuthToken(undefined);
+  return Promise.reject(err);
+});
+
+function subscribe(notify: () => void) {
+  listeners.add(notify);
+  return () => { listeners.delete(notify); };
+}
+
+/** The current token (undefined when signed out); re-renders on sign in/out. */
+export function useAuthToken() {
+  return useSyncExternalStore(subscribe, () => currentToken, () => undefined);
 }
 
 export default api;